@@ -1,24 +1,239 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 import time
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 import asyncio
-from typing import Dict, Optional, List, Any
+from typing import Dict, Optional, List, Any, Tuple, Callable, Sequence, Iterable, Literal
 import uuid
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from fastapi.requests import Request
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
 import random
 from datetime import datetime
 from enum import Enum
 import string
+import os
+import sys
+import multiprocessing
+import threading
+from collections import deque, OrderedDict, Counter
+from bisect import bisect_left, bisect_right
+from itertools import islice, accumulate
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import gzip
+from array import array
+import csv
+import io
+import math
+import struct
+import mmap
+import tempfile
+import weakref
+import sqlite3
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; column profiling falls back to pure Python
+    np = None
+
+# Logging: records are queued by the caller and formatted and written by a
+# background thread, so the event loop never blocks on stderr. Messages are
+# cut at LOG_MAX_MESSAGE_CHARS, and payloads wrapped in LogPayload show at
+# most LOG_PAYLOAD_MAX_ITEMS entries per container. LOG_SAMPLE_RATES keeps
+# only a share of the INFO/DEBUG records of some loggers, as comma-separated
+# name=rate pairs, where a name matches a logger or its last name components
+# (e.g. "progress=0.1" for <module>.progress).
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
+LOG_MAX_MESSAGE_CHARS = int(os.environ.get("LOG_MAX_MESSAGE_CHARS", 2000))
+LOG_PAYLOAD_MAX_ITEMS = 8
+LOG_SAMPLE_RATES = os.environ.get("LOG_SAMPLE_RATES", "progress=0.1")
+
+class LogPayload:
+    """Log argument summarizing a large value when (and only if) the record is written."""
+
+    def __init__(self, value: Any, depth: int = 2):
+        self.value = value
+        self.depth = depth
+
+    def __str__(self) -> str:
+        return summarize_payload(self.value, self.depth)
+
+def summarize_payload(value: Any, depth: int) -> str:
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f"<dict of {len(value)} keys>"
+        items = [f"{key!r}: {summarize_payload(item, depth - 1)}" for key, item in islice(value.items(), LOG_PAYLOAD_MAX_ITEMS)]
+        if len(value) > LOG_PAYLOAD_MAX_ITEMS:
+            items.append(f"... +{len(value) - LOG_PAYLOAD_MAX_ITEMS} keys")
+        return "{" + ", ".join(items) + "}"
+    if isinstance(value, (list, tuple)):
+        if depth <= 0:
+            return f"<{type(value).__name__} of {len(value)} items>"
+        items = [summarize_payload(item, depth - 1) for item in value[:LOG_PAYLOAD_MAX_ITEMS]]
+        if len(value) > LOG_PAYLOAD_MAX_ITEMS:
+            items.append(f"... +{len(value) - LOG_PAYLOAD_MAX_ITEMS} items")
+        return "[" + ", ".join(items) + "]"
+    text = repr(value)
+    return text if len(text) <= 80 else text[:77] + "..."
+
+class TruncatingFormatter(logging.Formatter):
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        message = super().formatMessage(record)
+        if len(message) > LOG_MAX_MESSAGE_CHARS:
+            message = f"{message[:LOG_MAX_MESSAGE_CHARS]}... [{len(message) - LOG_MAX_MESSAGE_CHARS} more chars]"
+        return message
+
+class SamplingFilter(logging.Filter):
+    """Let through one in every 1/rate INFO/DEBUG records of the sampled loggers."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.counters: Counter = Counter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = next((rate for name, rate in self.rates.items()
+                     if record.name == name or record.name.endswith("." + name)), None)
+        if rate is None:
+            return True
+        if rate <= 0:
+            return False
+        self.counters[record.name] += 1
+        return (self.counters[record.name] - 1) % max(1, round(1 / rate)) == 0
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The queue never leaves this process, so records travel as they are
+    instead of being formatted and stripped of their arguments up front.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    rates = {}
+    for entry in spec.split(","):
+        name, _, rate = entry.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+def setup_logging():
+    """Route root logging through a queue (like basicConfig, only if nothing is configured yet)."""
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(TruncatingFormatter(logging.BASIC_FORMAT))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(parse_sample_rates(LOG_SAMPLE_RATES)))
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+
+setup_logging()
 logger = logging.getLogger(__name__)
+# Per-step progress of node handlers (sampled by default, see LOG_SAMPLE_RATES)
+progress_logger = logging.getLogger(f"{__name__}.progress")
 
 app = FastAPI()
 
+# Node handlers are CPU-bound, so they run in a pool of worker processes
+# instead of on the event loop. The pool belongs to one API process: with
+# `uvicorn --workers N` every worker starts its own, so the default splits
+# the CPU cores between the WEB_CONCURRENCY API workers (uvicorn's default
+# for --workers). Set NODE_WORKER_PROCESSES to cores / N when passing
+# --workers explicitly.
+API_WORKER_PROCESSES = max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))
+NODE_WORKER_PROCESSES = int(os.environ.get("NODE_WORKER_PROCESSES", max(1, (os.cpu_count() or 1) // API_WORKER_PROCESSES)))
+
+# Admission control for node runs: at most MAX_CONCURRENT_RUNS run at once,
+# up to MAX_QUEUED_RUNS wait in a FIFO queue, and anything beyond that is
+# rejected with 503 and a Retry-After of RUN_QUEUE_RETRY_AFTER seconds.
+MAX_CONCURRENT_RUNS = int(os.environ.get("MAX_CONCURRENT_RUNS", NODE_WORKER_PROCESSES))
+MAX_QUEUED_RUNS = int(os.environ.get("MAX_QUEUED_RUNS", 100))
+RUN_QUEUE_RETRY_AFTER = int(os.environ.get("RUN_QUEUE_RETRY_AFTER", 10))
+
+# Simulated processing time added to every node run once it holds its run
+# slot, so the demo shows nodes running for a while (0 disables it)
+SIMULATED_NODE_DELAY_SECONDS = float(os.environ.get("SIMULATED_NODE_DELAY_SECONDS", 10))
+
+# Rows of a node's result table included in its JSON output; the full
+# table stays server-side and is paged through /output/{process_id}/rows
+FRONTEND_ROWS_LIMIT = 1000
+MAX_ROWS_PAGE_SIZE = 10000
+
+# Rows encoded per chunk when streaming a CSV export
+CSV_EXPORT_CHUNK_ROWS = 1000
+
+# Filtered/sorted row-index vectors remembered per result table
+MAX_CACHED_VIEWS_PER_TABLE = 16
+
+# Result tables of at least SPILL_MIN_TABLE_BYTES are written to a table
+# file under the run's tempFilePath and served through mmap
+SPILL_MIN_TABLE_BYTES = int(os.environ.get("SPILL_MIN_TABLE_BYTES", 64 * 1024))
+
+# Finished processes (and pipelines) are dropped PROCESS_TTL_SECONDS after
+# they end (0 keeps them until /reset). Outputs of finished processes are
+# evicted least recently used first once together they exceed
+# PROCESS_OUTPUT_MAX_BYTES; their status metadata is kept
+PROCESS_TTL_SECONDS = int(os.environ.get("PROCESS_TTL_SECONDS", 3600))
+PROCESS_OUTPUT_MAX_BYTES = int(os.environ.get("PROCESS_OUTPUT_MAX_BYTES", 512 * 1024 * 1024))
+PROCESS_SWEEP_INTERVAL = 60
+
+# Where process, pipeline and cancellation state lives: "memory" keeps it in
+# this API process; "sqlite" shares it between all `uvicorn --workers N`
+# processes through STATE_DB_PATH (SQLite in WAL mode), which other workers
+# poll every REMOTE_STATE_POLL_SECONDS. Process records are written behind,
+# batched every STATE_WRITE_INTERVAL seconds by a writer thread
+STATE_BACKEND = os.environ.get("STATE_BACKEND", "memory")
+STATE_DB_PATH = os.environ.get("STATE_DB_PATH", os.path.join(tempfile.gettempdir(), "dashboard_state.sqlite3"))
+REMOTE_STATE_POLL_SECONDS = 0.5
+STATE_WRITE_INTERVAL = 0.05
+STOP_WAIT_SECONDS = 10
+
+# gzip level of the /output bodies pre-encoded when a process finishes
+OUTPUT_GZIP_LEVEL = 6
+
+# Byte budget of the node result cache (0 disables caching)
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Sizing of the approximate column sketches used when a run asks for
+# profileMode="sketch" (see ColumnSketch); memory per column is fixed by
+# these and does not grow with the number of rows
+SKETCH_HLL_PRECISION = int(os.environ.get("SKETCH_HLL_PRECISION", 12))
+SKETCH_KLL_K = int(os.environ.get("SKETCH_KLL_K", 200))
+SKETCH_TOP_K_CAPACITY = int(os.environ.get("SKETCH_TOP_K_CAPACITY", 100))
+
+# Upper bounds on the synthetic table shape a run may request; rows and
+# columns are also bounded together by MAX_GENERATED_CELLS
+MAX_GENERATED_ROWS = int(os.environ.get("MAX_GENERATED_ROWS", 10_000_000))
+MAX_GENERATED_COLUMNS = int(os.environ.get("MAX_GENERATED_COLUMNS", 1000))
+MAX_GENERATED_CELLS = int(os.environ.get("MAX_GENERATED_CELLS", 100_000_000))
+
+# Column profiling works on PROFILE_CHUNK_ROWS-row chunks whose aggregates
+# are merged; tables of PROFILE_PARALLEL_MIN_ROWS rows or more spread their
+# chunks over a pool of PROFILE_WORKER_PROCESSES processes per node worker.
+# The node workers already take one core each, so the default splits the
+# cores between them (NODE_WORKER_PROCESSES x pool size <= cores); with one
+# node worker per core that means no pool at all.
+PROFILE_CHUNK_ROWS = int(os.environ.get("PROFILE_CHUNK_ROWS", 65536))
+PROFILE_PARALLEL_MIN_ROWS = int(os.environ.get("PROFILE_PARALLEL_MIN_ROWS", 200000))
+PROFILE_WORKER_PROCESSES = int(os.environ.get(
+    "PROFILE_WORKER_PROCESSES", max(1, (os.cpu_count() or 1) // max(1, NODE_WORKER_PROCESSES))
+))
+
 # Add CORS middleware with more permissive settings
 app.add_middleware(
     CORSMiddleware,
@@ -28,10 +243,175 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Bucket upper bounds (seconds) of the /metrics histograms
+RUN_DURATION_BUCKETS = (1, 2.5, 5, 10, 15, 20, 30, 45, 60, 120, 300, 600)
+REQUEST_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+EVENT_LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+# Seconds between event loop lag probes
+EVENT_LOOP_LAG_INTERVAL = 0.5
+
+def escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def metric_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    """Prometheus label set, e.g. {node_type="x",le="1"}."""
+    pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class MetricCounter:
+    """Monotonic counter per label set, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1):
+        self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{metric_labels(self.label_names, label_values)} {value}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self.series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, (counts, total, count) in sorted(self.series.items()):
+            for bound, cumulative in zip(self.buckets + ("+Inf",), accumulate(counts)):
+                labels = metric_labels(self.label_names, label_values, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = metric_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+# Metrics of this API worker process (each `uvicorn --workers N` worker keeps its own)
+node_run_duration = Histogram(
+    "node_run_duration_seconds", "Duration of node runs from start to their final status",
+    ("node_type", "status"), RUN_DURATION_BUCKETS
+)
+node_runs_total = MetricCounter("node_runs_total", "Node runs that reached a final status", ("status",))
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time until the response headers of an HTTP request are sent",
+    ("method", "path", "status"), REQUEST_LATENCY_BUCKETS
+)
+event_loop_lag = Histogram(
+    "event_loop_lag_seconds", "Delay of the event loop in waking up a periodic probe", (), EVENT_LOOP_LAG_BUCKETS
+)
+last_event_loop_lag = 0.0
+
+def node_type_label(node_id: str) -> str:
+    """node_id as a metric label; unknown ids share one label to bound cardinality."""
+    return node_id if node_id in NodeType._value2member_map_ else "other"
+
+class RequestMetricsMiddleware:
+    """ASGI middleware timing each HTTP request until its response headers are sent.
+
+    Requests are labelled with their route template (e.g. /status/{process_id})
+    rather than the raw path, so that ids do not create new series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        observed = False
+
+        def observe(status_code: int):
+            nonlocal observed
+            observed = True
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            http_request_duration.observe(time.perf_counter() - started, scope["method"], path, str(status_code))
+
+        async def send_timed(message):
+            if message["type"] == "http.response.start" and not observed:
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            if not observed:
+                observe(500)
+
+app.add_middleware(RequestMetricsMiddleware)
+
+async def monitor_event_loop_lag():
+    """Measure how late the event loop wakes up from a fixed sleep."""
+    global last_event_loop_lag
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(EVENT_LOOP_LAG_INTERVAL)
+        last_event_loop_lag = max(0.0, loop.time() - started - EVENT_LOOP_LAG_INTERVAL)
+        event_loop_lag.observe(last_event_loop_lag)
+
+event_loop_monitor: Optional[asyncio.Task] = None
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("FastAPI server starting up...")
     logger.info("CORS middleware configured")
+    get_task_manager()
+    global registry_sweeper, action_listener, event_loop_monitor
+    registry_sweeper = asyncio.create_task(sweep_registry_periodically())
+    event_loop_monitor = asyncio.create_task(monitor_event_loop_lag())
+    if get_state_backend().shared:
+        action_listener = asyncio.create_task(handle_routed_actions())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    global task_manager, shutting_down
+    shutting_down = True  # From here on no node worker is (re)started
+    if registry_sweeper is not None:
+        registry_sweeper.cancel()
+    if action_listener is not None:
+        action_listener.cancel()
+    if event_loop_monitor is not None:
+        event_loop_monitor.cancel()
+    # Stop queued and running runs (and pipelines) before their workers go away
+    pending_tasks = [task for task in tasks.values() if not task.done()]
+    for task in pending_tasks:
+        task.cancel()
+    await asyncio.gather(*pending_tasks, return_exceptions=True)
+    for process_id, process in processes.items():
+        if process.status not in TERMINAL_STATUSES:  # Cancelled while still queued
+            process.status = "stopped"
+            process.error = "Server shut down"
+            publish_process_event(process_id)
+    if task_manager is not None:
+        task_manager.shutdown()
+        task_manager = None
+    if state_backend is not None:
+        state_backend.close()
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -59,6 +439,28 @@ class NodeType(str, Enum):
     OUTPUT_RULES_COMP = "output_rules_comp"
     BREAK_ROLLING_COMP = "break_rolling_comp"
 
+# Upstream dependencies for each node, mirroring the edges drawn on the
+# completeness page. SRC and TGT branches only meet again at COMBINE_DATA_COMP.
+NODE_DEPENDENCIES: Dict[NodeType, List[NodeType]] = {
+    NodeType.CONFIG_COMP: [],
+    NodeType.READ_SRC_COMP: [NodeType.CONFIG_COMP],
+    NodeType.READ_TGT_COMP: [NodeType.CONFIG_COMP],
+    NodeType.PRE_HARMONISATION_SRC_COMP: [NodeType.READ_SRC_COMP],
+    NodeType.PRE_HARMONISATION_TGT_COMP: [NodeType.READ_TGT_COMP],
+    NodeType.HARMONISATION_SRC_COMP: [NodeType.PRE_HARMONISATION_SRC_COMP],
+    NodeType.HARMONISATION_TGT_COMP: [NodeType.PRE_HARMONISATION_TGT_COMP],
+    NodeType.ENRICHMENT_FILE_SEARCH_SRC_COMP: [NodeType.HARMONISATION_SRC_COMP],
+    NodeType.ENRICHMENT_FILE_SEARCH_TGT_COMP: [NodeType.HARMONISATION_TGT_COMP],
+    NodeType.ENRICHMENT_SRC_COMP: [NodeType.ENRICHMENT_FILE_SEARCH_SRC_COMP],
+    NodeType.ENRICHMENT_TGT_COMP: [NodeType.ENRICHMENT_FILE_SEARCH_TGT_COMP],
+    NodeType.DATA_TRANSFORM_SRC_COMP: [NodeType.ENRICHMENT_SRC_COMP],
+    NodeType.DATA_TRANSFORM_TGT_COMP: [NodeType.ENRICHMENT_TGT_COMP],
+    NodeType.COMBINE_DATA_COMP: [NodeType.DATA_TRANSFORM_SRC_COMP, NodeType.DATA_TRANSFORM_TGT_COMP],
+    NodeType.APPLY_RULES_COMP: [NodeType.COMBINE_DATA_COMP],
+    NodeType.OUTPUT_RULES_COMP: [NodeType.APPLY_RULES_COMP],
+    NodeType.BREAK_ROLLING_COMP: [NodeType.OUTPUT_RULES_COMP],
+}
+
 class RunParameters(BaseModel):
     expectedRunDate: str
     inputConfigFilePath: str
@@ -66,26 +468,62 @@ class RunParameters(BaseModel):
     rootFileDir: str
     runEnv: str
     tempFilePath: str
+    # "sketch" profiles columns with bounded-memory approximate sketches
+    profileMode: Literal["exact", "sketch"] = "exact"
+    # Shape of the synthetic table built by the generic node
+    numRows: int = Field(2000, ge=0, le=MAX_GENERATED_ROWS)
+    numCols: int = Field(100, ge=1, le=MAX_GENERATED_COLUMNS)
+    textColumnRatio: float = Field(0.3, ge=0, le=1)
+    longTextColumnRatio: float = Field(0.3, ge=0, le=1)
+    # Seed of the run's random generator; derived from node id and the other
+    # parameters when omitted, so identical runs produce identical outputs
+    seed: Optional[int] = Field(None, ge=0, lt=2 ** 64)
+
+    @model_validator(mode="after")
+    def check_generated_cells(self) -> "RunParameters":
+        if self.numRows * self.numCols > MAX_GENERATED_CELLS:
+            raise ValueError(f"numRows x numCols must not exceed {MAX_GENERATED_CELLS} cells")
+        return self
 
 class CalculationInput(BaseModel):
     nodeId: str
     parameters: RunParameters
     previousOutputs: Optional[Dict[str, Any]] = None
+    # Upstream node id -> process_id or output digest of an output the server holds
+    previousOutputRefs: Optional[Dict[str, str]] = None
 
 class ProcessStatus(BaseModel):
     process_id: str
-    status: str  # "pending", "running", "completed", "failed", "stopped"
+    status: str  # "pending", "queued", "running", "completed", "failed", "stopped"
     node_id: str
     output: Optional[Dict] = None
     error: Optional[str] = None
     start_time: float
+    end_time: Optional[float] = None
     parameters: Optional[Dict] = None
+    worker_pid: Optional[int] = None
+    cache_key: Optional[str] = None
+    cache_hit: bool = False
+    output_digest: Optional[str] = None
+    progress: Optional[float] = None
+    progress_message: Optional[str] = None
+    output_bytes: Optional[int] = None
+    output_evicted: bool = False
+    queue_position: Optional[int] = None  # 1-based place in the run queue while "queued"
 
 class ProcessResponse(BaseModel):
     process_id: str
     status: str
     output: Optional[Dict] = None
 
+class BatchStatusInput(BaseModel):
+    process_ids: List[str]
+    include_output: bool = False
+
+class PipelineRunInput(BaseModel):
+    targetNode: NodeType
+    parameters: RunParameters
+
 # Store process information and tasks in memory
 processes: Dict[str, ProcessStatus] = {}
 tasks: Dict[str, asyncio.Task] = {}
@@ -93,153 +531,2671 @@ tasks: Dict[str, asyncio.Task] = {}
 # Store process states
 process_states = {}
 
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to the Long-Running Calculator API"}
+# Store pipeline runs: pipeline_id -> {"target_node", "process_ids", ...}
+pipelines: Dict[str, Dict[str, Any]] = {}
 
-@app.post("/run/{node_id}")
-async def run_node(node_id: str, input_data: CalculationInput):
-    process_id = f"{node_id}_{int(time.time() * 1000)}"
-    
-    logger.info(f"📝 Received calculation request for node {node_id} - Process ID: {process_id}")
-    logger.info("📋 Parameters received:")
-    for key, value in input_data.parameters.dict().items():
-        logger.info(f"  - {key}: {value}")
-    
-    if input_data.previousOutputs:
-        logger.info("📋 Previous outputs received:")
-        for node_id, output in input_data.previousOutputs.items():
-            logger.info(f"  - From node {node_id}: {output}")
-    
-    # Store initial process state
-    processes[process_id] = ProcessStatus(
-        process_id=process_id,
-        status="running",
-        node_id=node_id,
-        start_time=time.time(),
-        parameters=input_data.parameters.dict()
-    )
-    
-    # Start the node processing in the background
-    task = asyncio.create_task(process_node_async(process_id, node_id, input_data.parameters, input_data.previousOutputs))
-    tasks[process_id] = task
-    
-    return {
-        "process_id": process_id,
-        "status": "running",
-        "message": f"Node {node_id} processing started"
-    }
+BLANKS_FILTER_VALUE = "(Blanks)"
 
-@app.get("/status/{process_id}")
-async def get_status(process_id: str):
-    if process_id not in processes:
-        raise HTTPException(status_code=404, detail="Process not found")
-    
-    process = processes[process_id]
-    elapsed_time = time.time() - process.start_time
-    
+def compile_condition(spec: Dict[str, Any]) -> Callable[[Any], bool]:
+    """Turn one AG Grid filter model entry into a predicate over cell values.
+
+    Mirrors the filtering done by AgGridTable.js: set filters (including the
+    "(Blanks)" entry), case-insensitive text filters and number filters. Combined
+    models ({"operator": "AND"|"OR", "conditions": [...]}) are supported too.
+    """
+    if "conditions" in spec:
+        predicates = [compile_condition({"filterType": spec.get("filterType"), **condition}) for condition in spec["conditions"]]
+        if str(spec.get("operator", "AND")).upper() == "OR":
+            return lambda value: any(predicate(value) for predicate in predicates)
+        return lambda value: all(predicate(value) for predicate in predicates)
+
+    filter_type = spec.get("filterType", "text")
+    if filter_type == "set":
+        values = set(str(value) for value in spec.get("values", []))
+        match_blanks = BLANKS_FILTER_VALUE in values
+
+        def set_predicate(value):
+            text = "" if value is None else str(value)
+            return text in values or (match_blanks and not text.strip())
+        return set_predicate
+
+    if filter_type == "text":
+        condition = spec.get("type", "contains")
+        search = str(spec.get("filter") or "").lower()
+        text_tests = {
+            "contains": lambda text: search in text,
+            "notContains": lambda text: search not in text,
+            "equals": lambda text: text == search,
+            "notEqual": lambda text: text != search,
+            "startsWith": lambda text: text.startswith(search),
+            "endsWith": lambda text: text.endswith(search),
+        }
+        if condition not in text_tests:
+            raise ValueError(f"Unsupported text filter type: {condition}")
+        text_test = text_tests[condition]
+        return lambda value: value is None or text_test(str(value).lower())
+
+    if filter_type == "number":
+        condition = spec.get("type", "equals")
+        number = float(spec["filter"]) if spec.get("filter") is not None else None
+        number_to = float(spec["filterTo"]) if spec.get("filterTo") is not None else None
+        number_tests = {
+            "equals": lambda x: x == number,
+            "notEqual": lambda x: x != number,
+            "greaterThan": lambda x: x > number,
+            "greaterThanOrEqual": lambda x: x >= number,
+            "lessThan": lambda x: x < number,
+            "lessThanOrEqual": lambda x: x <= number,
+            "inRange": lambda x: number <= x <= number_to,
+        }
+        if condition not in number_tests:
+            raise ValueError(f"Unsupported number filter type: {condition}")
+        if number is None or (condition == "inRange" and number_to is None):
+            raise ValueError(f"Number filter '{condition}' is missing its value")
+        number_test = number_tests[condition]
+
+        def number_predicate(value):
+            if value is None:
+                return True
+            try:
+                return number_test(float(value))
+            except (TypeError, ValueError):
+                return False
+        return number_predicate
+
+    raise ValueError(f"Unsupported filter type: {filter_type}")
+
+def parse_filter_model(raw: Optional[str]) -> Dict[str, Any]:
+    """Parse the JSON filter model passed in a query string ({} when absent)."""
+    if not raw:
+        return {}
+    try:
+        filter_model = json.loads(raw)
+    except ValueError:
+        raise ValueError("filter must be a JSON object")
+    if not isinstance(filter_model, dict) or not all(isinstance(spec, dict) for spec in filter_model.values()):
+        raise ValueError("filter must map column names to filter models")
+    return filter_model
+
+def parse_sort_model(raw: Optional[str]) -> List[Tuple[str, bool]]:
+    """Parse "col_a:asc,col_b:desc" into [(column, descending), ...]."""
+    sort_model = []
+    for item in (raw or "").split(","):
+        if not item:
+            continue
+        column, _, direction = item.partition(":")
+        direction = direction.lower() or "asc"
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"Invalid sort direction for {column}: {direction}")
+        sort_model.append((column, direction == "desc"))
+    return sort_model
+
+class TextColumn:
+    """Column of strings stored as one UTF-8 buffer plus an offsets array.
+
+    Value i is data[offsets[i]:offsets[i + 1]], so a column costs two
+    objects regardless of its length.
+    """
+
+    def __init__(self, data: bytes = b"", offsets: Optional[array] = None):
+        self.data = data
+        self.offsets = offsets if offsets is not None else array("q", [0])
+
+    @classmethod
+    def from_values(cls, values) -> "TextColumn":
+        encoded = [str(value).encode() for value in values]
+        offsets = array("q", [0])
+        position = 0
+        for value in encoded:
+            position += len(value)
+            offsets.append(position)
+        return cls(b"".join(encoded), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, idx: int) -> str:
+        if idx < 0:
+            idx += len(self)
+        return bytes(self.data[self.offsets[idx]:self.offsets[idx + 1]]).decode()
+
+    def __iter__(self):
+        data = self.data
+        offsets = self.offsets
+        for idx in range(len(offsets) - 1):
+            yield bytes(data[offsets[idx]:offsets[idx + 1]]).decode()
+
+    def slice(self, start: int, stop: int) -> "TextColumn":
+        """Values start..stop-1 as a new, independent TextColumn."""
+        base = self.offsets[start]
+        return TextColumn(bytes(self.data[base:self.offsets[stop]]),
+                          array("q", (offset - base for offset in self.offsets[start:stop + 1])))
+
+    def take(self, indices: Sequence[int]) -> "TextColumn":
+        """Values at `indices` as a new TextColumn, copied without decoding."""
+        data = self.data
+        offsets = self.offsets
+        values = [bytes(data[offsets[idx]:offsets[idx + 1]]) for idx in indices]
+        return TextColumn(b"".join(values), array("q", [0]) + array("q", accumulate(len(value) for value in values)))
+
+    def lengths(self):
+        """Byte length of every value, without decoding them."""
+        offsets = self.offsets
+        return (offsets[idx + 1] - offsets[idx] for idx in range(len(offsets) - 1))
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + self.offsets.itemsize * len(self.offsets)
+
+def cell_sort_key(value: Any) -> Tuple[int, Any]:
+    """Total order over mixed cells: numbers, then text, then other JSON values, then blanks."""
+    if value is None:
+        return (3, 0)
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    return (2, json.dumps(value, sort_keys=True, default=str))
+
+def column_from_values(values: List[Any]):
+    """Pick the most compact column type for a list of cell values."""
+    if values and all(type(value) is int for value in values):
+        return array("q", values)
+    if values and all(type(value) in (int, float) for value in values):
+        return array("d", values)
+    if all(isinstance(value, str) for value in values):
+        return TextColumn.from_values(values)
+    return list(values)  # Mixed or missing values stay boxed
+
+def column_nbytes(column) -> int:
+    if isinstance(column, (array, memoryview)):
+        return column.itemsize * len(column)
+    if isinstance(column, TextColumn):
+        return column.nbytes
+    return len(json.dumps(column, default=str))
+
+# Guards the view caches of all tables: views are computed on worker
+# threads (see table_view), and a lock per table would not survive pickling
+view_cache_lock = threading.Lock()
+
+class NodeTable:
+    """Full result table of a node, kept server-side for windowed access.
+
+    Storage is columnar: integer and float columns are array('q') / array('d'),
+    text columns are TextColumn buffers, so a table holds a handful of objects
+    per column instead of one per cell.
+    """
+
+    def __init__(self, headers: List[str], columns: List[Any]):
+        self.headers = headers
+        self.columns = columns
+        # (filter model, sort model) -> matching row indices, in LRU order
+        self.view_cache: "OrderedDict[str, array]" = OrderedDict()
+
+    @classmethod
+    def from_rows(cls, headers: List[str], rows: List[List[Any]]) -> "NodeTable":
+        return cls(headers, [column_from_values([row[idx] for row in rows]) for idx in range(len(headers))])
+
+    def __getstate__(self):
+        # Views are cheap to rebuild, so they never travel between processes
+        return {"headers": self.headers, "columns": self.columns}
+
+    def __setstate__(self, state):
+        self.__init__(state["headers"], state["columns"])
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.columns[0]) if self.columns else 0
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column_nbytes(column) for column in self.columns)
+
+    def slice_columns(self, start: int, stop: int) -> List[Any]:
+        """Rows start..stop-1 of every column, e.g. to profile a table in chunks."""
+        return [column.slice(start, stop) if isinstance(column, TextColumn) else column[start:stop]
+                for column in self.columns]
+
+    def update_digest(self, hasher):
+        """Feed the table contents into a hashlib object."""
+        hasher.update(json.dumps(self.headers).encode())
+        for column in self.columns:
+            if isinstance(column, (array, memoryview)):
+                hasher.update((column.typecode if isinstance(column, array) else column.format).encode())
+                hasher.update(column.tobytes())
+            elif isinstance(column, TextColumn):
+                hasher.update(column.offsets.tobytes())
+                hasher.update(column.data)
+            else:
+                hasher.update(json.dumps(column, default=str).encode())
+
+    def column_indices(self, columns: Optional[List[str]] = None) -> List[int]:
+        """Map column names to indices (all columns when `columns` is empty)."""
+        if not columns:
+            return list(range(len(self.headers)))
+        positions = {header: idx for idx, header in enumerate(self.headers)}
+        unknown = [column for column in columns if column not in positions]
+        if unknown:
+            raise KeyError(f"Unknown columns: {', '.join(unknown)}")
+        return [positions[column] for column in columns]
+
+    def view(self, filter_model: Dict[str, Any], sort_model: List[Tuple[str, bool]]) -> Optional[array]:
+        """Row indices matching `filter_model`, ordered by `sort_model`.
+
+        Returns None for the unfiltered, unsorted view. Results are cached per
+        (filter, sort) pair so paging through a view does not re-scan the table.
+        """
+        if not filter_model and not sort_model:
+            return None
+        key = json.dumps([filter_model, sort_model], sort_keys=True)
+        with view_cache_lock:
+            indices = self.view_cache.get(key)
+            if indices is not None:
+                self.view_cache.move_to_end(key)
+                return indices
+
+        # Narrow the candidate rows one filtered column at a time
+        matching = range(self.num_rows)
+        filter_columns = self.column_indices(list(filter_model))
+        for idx, spec in zip(filter_columns, filter_model.values()):
+            predicate = compile_condition(spec)
+            column = self.columns[idx]
+            matching = [row_idx for row_idx in matching if predicate(column[row_idx])]
+        matching = list(matching)
+
+        sort_columns = self.column_indices([column for column, _ in sort_model]) if sort_model else []
+        # Stable sorts applied from the least to the most significant key
+        for idx, (_, descending) in reversed(list(zip(sort_columns, sort_model))):
+            column = self.columns[idx]
+            if isinstance(column, (array, memoryview, TextColumn)):
+                matching.sort(key=column.__getitem__, reverse=descending)  # One type, no blanks
+            else:
+                matching.sort(key=lambda row_idx: cell_sort_key(column[row_idx]), reverse=descending)
+
+        indices = array("q", matching)
+        with view_cache_lock:
+            self.view_cache[key] = indices
+            if len(self.view_cache) > MAX_CACHED_VIEWS_PER_TABLE:
+                self.view_cache.popitem(last=False)
+        return indices
+
+    def iter_csv(self, column_indices: List[int], row_indices: Optional[Sequence[int]] = None, chunk_rows: int = CSV_EXPORT_CHUNK_ROWS):
+        """Yield the selected rows as CSV text, `chunk_rows` rows per chunk."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([self.headers[idx] for idx in column_indices])
+        total = self.num_rows if row_indices is None else len(row_indices)
+        for offset in range(0, total, chunk_rows):
+            writer.writerows(self.window(offset, chunk_rows, column_indices, row_indices))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()  # Header only, for empty views
+
+    def window_columns(self, offset: int, limit: int, column_indices: List[int],
+                       row_indices: Optional[Sequence[int]] = None) -> List[Any]:
+        """Like window, but column-major: the selected rows of each selected column."""
+        if row_indices is None:
+            stop = min(offset + limit, self.num_rows)
+            start = min(offset, stop)
+            return [self.columns[idx].slice(start, stop) if isinstance(self.columns[idx], TextColumn)
+                    else self.columns[idx][start:stop] for idx in column_indices]
+        selected_rows = row_indices[offset:offset + limit]
+        window = []
+        for idx in column_indices:
+            column = self.columns[idx]
+            if isinstance(column, TextColumn):
+                window.append(column.take(selected_rows))
+            elif isinstance(column, (array, memoryview)):
+                window.append(array(column.typecode if isinstance(column, array) else column.format,
+                                    (column[row_idx] for row_idx in selected_rows)))
+            else:
+                window.append([column[row_idx] for row_idx in selected_rows])
+        return window
+
+    def window(self, offset: int, limit: int, column_indices: List[int], row_indices: Optional[Sequence[int]] = None) -> List[List[Any]]:
+        if row_indices is None:
+            selected_rows = range(offset, min(offset + limit, self.num_rows))
+        else:
+            selected_rows = row_indices[offset:offset + limit]
+        columns = [self.columns[idx] for idx in column_indices]
+        return [[column[row_idx] for column in columns] for row_idx in selected_rows]
+
+# Magic bytes opening a columnar transfer payload (see encode_columnar)
+COLUMNAR_MAGIC = b"NTCOLS01"
+COLUMNAR_MEDIA_TYPE = "application/vnd.node-table.columnar"
+
+def little_endian(buffer: array) -> array:
+    if sys.byteorder == "big":
+        buffer = array(buffer.typecode, buffer)
+        buffer.byteswap()
+    return buffer
+
+def columnar_buffers(column) -> Tuple[str, List[Any]]:
+    """Transfer type and buffers of one column (see encode_columnar)."""
+    if isinstance(column, (array, memoryview)):
+        if (column.typecode if isinstance(column, array) else column.format) == "d":
+            return "float64", [little_endian(array("d", column))]
+        values = array("q", column)
+        if not values or (-2 ** 31 <= min(values) and max(values) < 2 ** 31):
+            return "int32", [little_endian(array("i", values))]
+        return "int64", [little_endian(values)]
+    column_type = "string"
+    if not isinstance(column, TextColumn):
+        column_type = "json"
+        column = TextColumn.from_values(json.dumps(value, default=str) for value in column)
+    base = column.offsets[0]
+    return column_type, [little_endian(array("I", (offset - base for offset in column.offsets))),
+                         column.data[base:column.offsets[-1]]]
+
+def encode_columnar(headers: List[str], columns: List[Any], metadata: Dict[str, Any]) -> bytes:
+    """Encode table columns for the browser as length-prefixed, little-endian buffers.
+
+    The payload starts with COLUMNAR_MAGIC and the uint32 byte length of a
+    UTF-8 JSON header ({**metadata, "num_rows", "columns": [{"name",
+    "type"}]}), padded to 8 bytes. The buffers of every column follow in
+    order, each as a uint64 byte length plus the data padded to 8 bytes, so
+    each one can be viewed in place as a TypedArray: "int32", "int64" and
+    "float64" columns have one Int32Array / BigInt64Array / Float64Array;
+    "string" and "json" (mixed values as JSON texts) columns have Uint32Array
+    offsets (num_rows + 1) followed by the UTF-8 data.
+    """
+    encoded = [columnar_buffers(column) for column in columns]
+    header = json.dumps({
+        **metadata,
+        "num_rows": len(columns[0]) if columns else 0,
+        "columns": [{"name": name, "type": column_type} for name, (column_type, _) in zip(headers, encoded)],
+    }, default=str).encode()
+    payload = bytearray(COLUMNAR_MAGIC)
+    payload.extend(struct.pack("<I", len(header)))
+    payload.extend(header)
+    payload.extend(b"\0" * (-len(payload) % 8))
+    for _, buffers in encoded:
+        for buffer in buffers:
+            data = memoryview(buffer).cast("B")
+            payload.extend(struct.pack("<Q", len(data)))
+            payload.extend(data)
+            payload.extend(b"\0" * (-len(data) % 8))
+    return bytes(payload)
+
+# Magic bytes at both ends of a table file (see write_table_file)
+TABLE_FILE_MAGIC = b"NODETBL1"
+
+def write_table_file(table: NodeTable, path: str):
+    """Write a table to `path` in a compact binary columnar layout.
+
+    The file starts with TABLE_FILE_MAGIC, followed by one 8-byte aligned
+    buffer per column: raw array('q'/'d') items, or for text the UTF-8 data
+    and then its int64 offsets; mixed columns are stored as JSON. A JSON
+    footer ({"headers", "columns": [{"type", "length", "offset", "size",
+    "offsets_offset"}]}) comes next, and the file ends with the footer length
+    as a little-endian uint64 and the magic again. Numbers use the native
+    byte order, as files are only read back on the host that wrote them.
+    The file is written under a temporary name and renamed into place.
+    """
+    partial_path = f"{path}.partial"
+    layout = {"headers": table.headers, "columns": []}
+    with open(partial_path, "wb") as f:
+        f.write(TABLE_FILE_MAGIC)
+
+        def write_aligned(buffer) -> int:
+            f.write(b"\0" * (-f.tell() % 8))
+            offset = f.tell()
+            f.write(buffer)
+            return offset
+
+        for column in table.columns:
+            if isinstance(column, array):
+                entry = {"type": column.typecode, "offset": write_aligned(column), "size": column.itemsize * len(column)}
+            elif isinstance(column, TextColumn):
+                entry = {"type": "text", "offset": write_aligned(column.data), "size": len(column.data)}
+                entry["offsets_offset"] = write_aligned(column.offsets)
+            else:
+                encoded = json.dumps(column, default=str).encode()
+                entry = {"type": "json", "offset": write_aligned(encoded), "size": len(encoded)}
+            entry["length"] = len(column)
+            layout["columns"].append(entry)
+        footer = json.dumps(layout).encode()
+        f.write(footer)
+        f.write(struct.pack("<Q", len(footer)))
+        f.write(TABLE_FILE_MAGIC)
+    os.replace(partial_path, path)
+
+class TableFile:
+    """Picklable reference to a table file, sent from a worker instead of the table."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+class MappedNodeTable(NodeTable):
+    """NodeTable whose columns are read-only views into an mmap of a table file.
+
+    Numeric columns are memoryviews cast to 'q'/'d' and text columns are
+    TextColumns over slices of the mapping, so the process holds little more
+    than the file handle; pages come from the OS page cache on access. The
+    file is removed once the last reference to the table goes away, unless
+    `owned` is False (another API worker's table, see find_result_table).
+    """
+
+    def __init__(self, path: str, owned: bool = True):
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        trailer = len(TABLE_FILE_MAGIC) + 8
+        if mapping[:len(TABLE_FILE_MAGIC)] != TABLE_FILE_MAGIC or mapping[-len(TABLE_FILE_MAGIC):] != TABLE_FILE_MAGIC:
+            raise ValueError(f"Not a table file: {path}")
+        footer_size = struct.unpack_from("<Q", mapping, len(mapping) - trailer)[0]
+        layout = json.loads(mapping[len(mapping) - trailer - footer_size:len(mapping) - trailer])
+        view = memoryview(mapping)
+        columns = []
+        for entry in layout["columns"]:
+            data = view[entry["offset"]:entry["offset"] + entry["size"]]
+            if entry["type"] == "text":
+                offsets_end = entry["offsets_offset"] + 8 * (entry["length"] + 1)
+                columns.append(TextColumn(data, view[entry["offsets_offset"]:offsets_end].cast("q")))
+            elif entry["type"] == "json":
+                columns.append(json.loads(bytes(data)))
+            else:
+                columns.append(data.cast(entry["type"]))
+        super().__init__(layout["headers"], columns)
+        self.path = path
+        if owned:
+            weakref.finalize(self, remove_table_file, path)
+
+    def __reduce__(self):
+        raise TypeError("MappedNodeTable is bound to this process; send TableFile(path) instead")
+
+def remove_table_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def spill_table(table: NodeTable, temp_dir: str, process_id: str):
+    """Write a worker's result table under `temp_dir` and return a TableFile.
+
+    Tables under SPILL_MIN_TABLE_BYTES, or ones that cannot be written, are
+    returned unchanged and travel back to the API process in memory. With a
+    shared state backend every table is spilled, so that all API workers
+    can open it.
+    """
+    if STATE_BACKEND == "memory" and table.nbytes < SPILL_MIN_TABLE_BYTES:
+        return table
+    directory = os.path.join(temp_dir or tempfile.gettempdir(), "node_outputs")
+    path = os.path.join(directory, f"{process_id}_{uuid.uuid4().hex[:8]}.table")
+    try:
+        os.makedirs(directory, exist_ok=True)
+        write_table_file(table, path)
+    except OSError as e:
+        logger.warning("⚠️ Could not spill result table to %s: %s", directory, e)
+        return table
+    return TableFile(path)
+
+# Full result tables of completed processes: process_id -> NodeTable
+process_tables: Dict[str, NodeTable] = {}
+
+def split_output_table(output: Dict) -> Tuple[Dict, Optional[NodeTable]]:
+    """Move the full result table out of a node output.
+
+    Handlers may return calculation_results["table"] either as a NodeTable or
+    as a list of rows. The returned output holds None there instead, and
+    output_with_preview puts the first FRONTEND_ROWS_LIMIT rows back when the
+    output is served; outputs without a table are returned as is.
+    """
+    results = output.get("calculation_results")
+    if not isinstance(results, dict) or "headers" not in results:
+        return output, None
+    table = results.get("table")
+    if isinstance(table, list):
+        table = NodeTable.from_rows(results["headers"], table)
+    elif not isinstance(table, NodeTable):
+        return output, None
+    return {**output, "calculation_results": {**results, "table": None}}, table
+
+def output_with_preview(process_id: str) -> Optional[Dict]:
+    """Output of a process as served, with the first FRONTEND_ROWS_LIMIT table rows inlined."""
+    process_registry.touch(process_id)
+    return inline_table_preview(find_process(process_id).output, find_result_table(process_id))
+
+# /output bodies of finished processes, encoded once: process_id -> (JSON bytes, gzip bytes)
+encoded_outputs: Dict[str, Tuple[bytes, bytes]] = {}
+
+def json_bytes(content: Any) -> bytes:
+    """Same encoding as JSONResponse."""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def encoded_size(encoded: Optional[Tuple[bytes, bytes]]) -> int:
+    return len(encoded[0]) + len(encoded[1]) if encoded is not None else 0
+
+def encode_output(output: Optional[Dict]) -> Tuple[bytes, bytes]:
+    body = json_bytes(output)
+    return body, gzip.compress(body, compresslevel=OUTPUT_GZIP_LEVEL, mtime=0)
+
+def encode_node_output(process_id: str, output: Dict, table: Optional[NodeTable]) -> Optional[Tuple[bytes, bytes]]:
+    """/output body of a finished node, encoded once where the output is produced.
+
+    Node workers call this before sending their result back, so the JSON and
+    gzip work never runs on the API event loop.
+    """
+    try:
+        return encode_output(inline_table_preview(output, table))
+    except (TypeError, ValueError) as e:
+        logger.warning("⚠️ Could not pre-encode output of %s: %s", process_id, e)
+        return None
+
+def encoded_output(process_id: str) -> Tuple[bytes, bytes]:
+    """Pre-encoded output of a process, encoding it now if it is not held here."""
+    encoded = encoded_outputs.get(process_id)
+    if encoded is None:
+        return encode_output(output_with_preview(process_id))
+    process_registry.touch(process_id)
+    return encoded
+
+def accepts_gzip(request: Request) -> bool:
+    """Whether the client's Accept-Encoding allows a gzip response."""
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() not in ("gzip", "*"):
+            continue
+        params = params.replace(" ", "")
+        try:
+            return not params.startswith("q=") or float(params[2:]) > 0
+        except ValueError:
+            return True
+    return False
+
+def inline_table_preview(output: Optional[Dict], table: Optional[NodeTable]) -> Optional[Dict]:
+    if output is None or table is None:
+        return output
+    preview_rows = table.window(0, FRONTEND_ROWS_LIMIT, table.column_indices())
+    return {**output, "calculation_results": {**output["calculation_results"], "table": preview_rows}}
+
+async def upstream_previews(upstreams: Dict[str, Tuple[Optional[Dict], Optional[NodeTable]]]) -> Dict[str, Optional[Dict]]:
+    """inline_table_preview of each upstream (output, table), built on a worker thread."""
+    def build():
+        return {upstream_id: inline_table_preview(output, table) for upstream_id, (output, table) in upstreams.items()}
+    return await asyncio.get_running_loop().run_in_executor(None, build)
+
+# SSE subscribers waiting for updates of a process: process_id -> queues
+process_subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+TERMINAL_STATUSES = {"completed", "failed", "stopped", "reset"}
+
+# Seconds between SSE keep-alive comments on an idle stream
+SSE_KEEPALIVE_SECONDS = 15
+
+def process_snapshot(process: "ProcessStatus") -> Dict[str, Any]:
+    """Lightweight view of a process: state, timing and progress, but no output."""
     return {
-        "process_id": process_id,
+        "process_id": process.process_id,
         "status": process.status,
         "node_id": process.node_id,
-        "output": process.output,
         "error": process.error,
-        "elapsed_time": f"{elapsed_time:.2f} seconds",
-        "parameters": process.parameters
+        "elapsed_time": f"{(process.end_time or time.time()) - process.start_time:.2f} seconds",
+        "progress": process.progress,
+        "progress_message": process.progress_message,
+        "queue_position": process.queue_position if process.status == "queued" else None,
+        "cache_hit": process.cache_hit,
+        "has_output": process.output is not None,
+        "output_digest": process.output_digest,
+        "output_bytes": process.output_bytes,
+        "output_evicted": process.output_evicted,
     }
 
-@app.post("/stop/{process_id}")
-async def stop_process(process_id: str):
-    if process_id not in processes:
-        raise HTTPException(status_code=404, detail="Process not found")
-    
-    if process_id in tasks and not tasks[process_id].done():
-        tasks[process_id].cancel()
-        try:
-            await tasks[process_id]
-        except asyncio.CancelledError:
-            processes[process_id].status = "stopped"
-            processes[process_id].error = "Process stopped by user"
-        
-        del tasks[process_id]
-        
-    return {
-        "process_id": process_id,
-        "status": processes[process_id].status,
-        "message": "Process stopped"
+def publish_process_event(process_id: str, snapshot: Optional[Dict[str, Any]] = None):
+    """Record a status transition of a process and push it to every SSE subscriber."""
+    process = processes.get(process_id)
+    if process is not None and process.status in TERMINAL_STATUSES and process.end_time is None:
+        process.end_time = time.time()
+        node_runs_total.inc(process.status)
+    if process is not None:
+        save_process_state(process_id)
+    subscribers = process_subscribers.get(process_id)
+    if not subscribers:
+        return
+    if snapshot is None:
+        snapshot = process_snapshot(processes[process_id])
+    for subscriber in subscribers:
+        subscriber.put_nowait(snapshot)
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+async def stream_process_events(process_ids: List[str]):
+    """Yield SSE messages for the given processes until all of them are finished.
+
+    Processes run by this API worker push their updates through
+    process_subscribers; those owned by other workers are polled from the
+    state backend every REMOTE_STATE_POLL_SECONDS.
+    """
+    subscriber: asyncio.Queue = asyncio.Queue()
+    for process_id in process_ids:
+        process_subscribers.setdefault(process_id, []).append(subscriber)
+    try:
+        pending = set()
+        remote: Dict[str, Dict[str, Any]] = {}  # process_id -> last snapshot sent
+        for process_id in process_ids:
+            process = find_process(process_id)
+            if process is None:
+                continue
+            snapshot = process_snapshot(process)
+            yield format_sse("status", snapshot)
+            if snapshot["status"] not in TERMINAL_STATUSES:
+                pending.add(process_id)
+                if process_id not in processes:
+                    remote[process_id] = snapshot
+
+        last_sent = time.time()
+        while pending:
+            try:
+                snapshots = [await asyncio.wait_for(
+                    subscriber.get(), timeout=REMOTE_STATE_POLL_SECONDS if remote else SSE_KEEPALIVE_SECONDS
+                )]
+            except asyncio.TimeoutError:
+                snapshots = poll_remote_snapshots(remote)
+                if not snapshots:
+                    if time.time() - last_sent >= SSE_KEEPALIVE_SECONDS:
+                        last_sent = time.time()
+                        yield ": keep-alive\n\n"
+                    continue
+            for snapshot in snapshots:
+                last_sent = time.time()
+                yield format_sse("status", snapshot)
+                if snapshot["status"] in TERMINAL_STATUSES:
+                    pending.discard(snapshot["process_id"])
+                    remote.pop(snapshot["process_id"], None)
+        yield format_sse("end", {"process_ids": process_ids})
+    finally:
+        for process_id in process_ids:
+            subscribers = process_subscribers.get(process_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                process_subscribers.pop(process_id, None)
+
+def poll_remote_snapshots(remote: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Changed snapshots of processes owned by other API workers (updates `remote`)."""
+    changed = []
+    for process_id, previous in remote.items():
+        process = find_process(process_id)
+        snapshot = process_snapshot(process) if process is not None else {**previous, "status": "reset"}
+        if {**snapshot, "elapsed_time": None} != {**previous, "elapsed_time": None}:
+            remote[process_id] = snapshot
+            changed.append(snapshot)
+    return changed
+
+class NodeExecutionError(Exception):
+    """Raised in the API process when a node handler failed inside a worker."""
+
+def output_fingerprint(output: Any, table: Optional[NodeTable] = None) -> Tuple[str, int]:
+    """Return (sha256 digest, size in bytes) of an output and its result table.
+
+    The output is hashed through its canonical JSON encoding, the table
+    through its column buffers.
+    """
+    encoded = json.dumps(output, sort_keys=True, separators=(",", ":"), default=str).encode()
+    hasher = hashlib.sha256(encoded)
+    nbytes = len(encoded)
+    if table is not None:
+        table.update_digest(hasher)
+        nbytes += table.nbytes
+    return hasher.hexdigest(), nbytes
+
+def compute_cache_key(node_id: str, params: "RunParameters", upstream_digests: Dict[str, str]) -> str:
+    """Stable hash of everything a node's output depends on."""
+    key_source = {
+        "node_id": node_id,
+        "parameters": params.dict(),
+        "upstream": upstream_digests,
     }
+    return hashlib.sha256(json.dumps(key_source, sort_keys=True).encode()).hexdigest()
+
+class ResultCache:
+    """LRU cache of completed node outputs, bounded by total output bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        # key -> (output, table, digest, nbytes, encoded /output body or None)
+        self.entries: "OrderedDict[str, Tuple[Dict, Optional[NodeTable], str, int, Optional[Tuple[bytes, bytes]]]]" = OrderedDict()
+        self.total_bytes = 0
+        # digest -> number of entries holding that output
+        self.digests: "Counter[str]" = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Tuple[Dict, Optional[NodeTable], str, int, Optional[Tuple[bytes, bytes]]]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, output: Dict, table: Optional[NodeTable], digest: str, nbytes: int,
+            encoded: Optional[Tuple[bytes, bytes]] = None):
+        if nbytes + encoded_size(encoded) > self.max_bytes:
+            return
+        if key in self.entries:
+            replaced = self.entries.pop(key)
+            self.total_bytes -= self.entry_bytes(replaced)
+            self.digests[replaced[2]] -= 1
+            if not self.digests[replaced[2]]:
+                del self.digests[replaced[2]]
+        self.entries[key] = (output, table, digest, nbytes, encoded)
+        self.digests[digest] += 1
+        self.total_bytes += nbytes + encoded_size(encoded)
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.total_bytes -= self.entry_bytes(evicted)
+            self.digests[evicted[2]] -= 1
+            if not self.digests[evicted[2]]:
+                del self.digests[evicted[2]]
+            self.evictions += 1
+
+    def holds(self, digest: Optional[str]) -> bool:
+        """Whether some entry keeps the output with this digest (and its table) alive."""
+        return digest in self.digests
+
+    @staticmethod
+    def entry_bytes(entry) -> int:
+        return entry[3] + encoded_size(entry[4])
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+result_cache = ResultCache(RESULT_CACHE_MAX_BYTES)
+
+class ProcessRegistry:
+    """Lifetime and memory bookkeeping for the entries of `processes`.
+
+    Every finished process with an output is tracked with the size of that
+    output (encoded JSON plus result table bytes, as measured by
+    output_fingerprint, plus the encoded /output body) in least recently used
+    order. Outputs are charged once per output digest: processes with the
+    same digest share one table (e.g. result cache hits), and outputs whose
+    digest the result cache also holds count towards the cache's budget
+    only. Once the total exceeds `max_output_bytes`, the least recently used
+    outputs are evicted: output and result table are dropped, while the
+    status metadata stays and is flagged output_evicted. Outputs whose table
+    stays alive anyway (held by the result cache or shared with the newest
+    output) are skipped, and the newest output is always kept. sweep() drops
+    finished processes and pipelines that ended more than `ttl_seconds` ago.
+    """
+
+    def __init__(self, max_output_bytes: int, ttl_seconds: int):
+        self.max_output_bytes = max_output_bytes
+        self.ttl_seconds = ttl_seconds
+        self.output_sizes: "OrderedDict[str, int]" = OrderedDict()
+        # process_id -> output digest, and how many tracked outputs share each digest
+        self.output_digests: Dict[str, str] = {}
+        self.digest_refs: "Counter[str]" = Counter()
+        self.evicted_outputs = 0
+        self.expired_processes = 0
+        self.expired_pipelines = 0
+
+    def track_output(self, process_id: str, nbytes: int):
+        """Account for the output (and encoded body) just stored on a process, evicting older ones if needed."""
+        nbytes += encoded_size(encoded_outputs.get(process_id))
+        processes[process_id].output_bytes = nbytes
+        save_process_state(process_id)
+        self.forget(process_id)
+        digest = processes[process_id].output_digest or process_id
+        self.output_sizes[process_id] = nbytes
+        self.output_digests[process_id] = digest
+        self.digest_refs[digest] += 1
+        total_bytes = self.total_bytes
+        for evicted_id in list(self.output_sizes)[:-1]:
+            if total_bytes <= self.max_output_bytes:
+                break
+            evicted_digest = self.output_digests[evicted_id]
+            if evicted_digest == digest or result_cache.holds(evicted_digest):
+                continue  # The table stays alive for the newest output or the cache; nothing to free
+            evicted_bytes = self.output_sizes[evicted_id]
+            if self.digest_refs[evicted_digest] == 1:
+                total_bytes -= evicted_bytes  # Last process holding this table
+            self.forget(evicted_id)
+            evicted = processes.get(evicted_id)
+            process_tables.pop(evicted_id, None)
+            encoded_outputs.pop(evicted_id, None)
+            if evicted is not None:
+                evicted.output = None
+                evicted.output_evicted = True
+                save_process_state(evicted_id)
+            self.evicted_outputs += 1
+            logger.info("🧹 Evicted output of %s (%s bytes) to stay within the output budget", evicted_id, evicted_bytes)
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes of tracked outputs, once per digest and without those the result cache holds."""
+        digest_sizes = {
+            self.output_digests[process_id]: nbytes for process_id, nbytes in self.output_sizes.items()
+            if not result_cache.holds(self.output_digests[process_id])
+        }
+        return sum(digest_sizes.values())
+
+    def touch(self, process_id: str):
+        if process_id in self.output_sizes:
+            self.output_sizes.move_to_end(process_id)
+
+    def forget(self, process_id: str):
+        self.output_sizes.pop(process_id, None)
+        digest = self.output_digests.pop(process_id, None)
+        if digest is not None:
+            self.digest_refs[digest] -= 1
+            if not self.digest_refs[digest]:
+                del self.digest_refs[digest]
+
+    def sweep(self, now: Optional[float] = None):
+        """Drop finished processes and pipelines older than the TTL."""
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = (now or time.time()) - self.ttl_seconds
+        expired = [
+            process_id for process_id, process in processes.items()
+            if process.status in TERMINAL_STATUSES and process.end_time is not None and process.end_time < cutoff
+        ]
+        for process_id in expired:
+            remove_process(process_id)
+        self.expired_processes += len(expired)
+        expired_pipelines = [
+            pipeline_id for pipeline_id, pipeline in pipelines.items()
+            if pipeline["end_time"] is not None and pipeline["end_time"] < cutoff
+        ]
+        for pipeline_id in expired_pipelines:
+            del pipelines[pipeline_id]
+            tasks.pop(pipeline_id, None)
+            get_state_backend().delete_pipeline(pipeline_id)
+        self.expired_pipelines += len(expired_pipelines)
+        if expired or expired_pipelines:
+            logger.info("🧹 Expired %s processes and %s pipelines past their TTL", len(expired), len(expired_pipelines))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "processes": len(processes),
+            "pipelines": len(pipelines),
+            "outputs": len(self.output_sizes),
+            "output_bytes": self.total_bytes,
+            "shared_bytes": sum(self.output_sizes.values()) - self.total_bytes,
+            "max_output_bytes": self.max_output_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted_outputs": self.evicted_outputs,
+            "expired_processes": self.expired_processes,
+            "expired_pipelines": self.expired_pipelines,
+        }
+
+process_registry = ProcessRegistry(PROCESS_OUTPUT_MAX_BYTES, PROCESS_TTL_SECONDS)
+registry_sweeper: Optional[asyncio.Task] = None
+
+def remove_process(process_id: str):
+    """Forget a finished process: status, output, result table and task handle."""
+    processes.pop(process_id, None)
+    process_tables.pop(process_id, None)
+    encoded_outputs.pop(process_id, None)
+    process_registry.forget(process_id)
+    get_state_backend().delete_process(process_id)
+    task = tasks.get(process_id)
+    if task is not None and task.done():
+        del tasks[process_id]
+
+async def sweep_registry_periodically():
+    while True:
+        await asyncio.sleep(PROCESS_SWEEP_INTERVAL)
+        process_registry.sweep()
+
+class InMemoryStateBackend:
+    """State backend of a single API process: `processes` is the whole truth."""
+
+    shared = False
+
+    def save_process(self, process: "ProcessStatus", table_path: Optional[str]):
+        pass
+
+    def load_process(self, process_id: str) -> Optional[Tuple["ProcessStatus", Optional[str]]]:
+        return None
+
+    def delete_process(self, process_id: str):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def save_pipeline(self, pipeline: Dict[str, Any]):
+        pass
+
+    def load_pipeline(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def delete_pipeline(self, pipeline_id: str):
+        pass
+
+    def request_action(self, process_id: str, action: str) -> bool:
+        return False
+
+    def take_actions(self) -> List[Tuple[str, str]]:
+        return []
+
+class SQLiteStateBackend:
+    """Process and pipeline state shared by all API workers through one SQLite file.
+
+    Every worker writes the processes it runs (status, progress, output and
+    the path of the spilled result table) and reads the others' on demand.
+    Stop and reset requests for another worker's process are queued in the
+    actions table for that owner, which polls it (see handle_routed_actions).
+    The database runs in WAL mode so readers never block the writer.
+
+    Process writes (one per status or progress event) are write-behind: they
+    are queued per process_id, so only the latest record of a process is
+    kept, and a writer thread commits them in one transaction every
+    STATE_WRITE_INTERVAL seconds, off the event loop. New processes are
+    flushed at once (see flush()), so another worker never answers 404 for
+    a process id that was already handed out.
+    """
+
+    shared = True
+
+    def __init__(self, path: str):
+        self.owner = os.getpid()
+        self.conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processes ("
+            "process_id TEXT PRIMARY KEY, owner INTEGER NOT NULL, record TEXT NOT NULL, table_path TEXT)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pipelines (pipeline_id TEXT PRIMARY KEY, owner INTEGER NOT NULL, record TEXT NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS actions (process_id TEXT PRIMARY KEY, owner INTEGER NOT NULL, action TEXT NOT NULL)"
+        )
+        # process_id -> (record, table_path) to write, or None to delete
+        self.pending_writes: Dict[str, Optional[Tuple[str, Optional[str]]]] = {}
+        self.writes_lock = threading.Lock()
+        self.commit_lock = threading.Lock()
+        self.writes_ready = threading.Event()
+        self.closing = False
+        self.writer = threading.Thread(target=self.write_pending, args=(path,), name="state-writer", daemon=True)
+        self.writer.start()
+
+    def write_pending(self, path: str):
+        """Writer thread: commit the queued process writes in batches until close()."""
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None)
+        while True:
+            self.writes_ready.wait()
+            closing = self.closing
+            self.commit_writes(conn)
+            if closing:
+                conn.close()
+                return
+            time.sleep(STATE_WRITE_INTERVAL)
+
+    def commit_writes(self, conn: sqlite3.Connection):
+        """Commit every queued process write in one transaction on `conn`."""
+        # Held for the whole commit, so batches never land out of order
+        with self.commit_lock:
+            with self.writes_lock:
+                writes, self.pending_writes = self.pending_writes, {}
+                self.writes_ready.clear()
+            if not writes:
+                return
+            try:
+                conn.execute("BEGIN")
+                for process_id, row in writes.items():
+                    if row is None:
+                        conn.execute("DELETE FROM processes WHERE process_id = ?", (process_id,))
+                    else:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO processes (process_id, owner, record, table_path) VALUES (?, ?, ?, ?)",
+                            (process_id, self.owner, row[0], row[1])
+                        )
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                logger.error("❌ Failed to write %s process records to the state database: %s", len(writes), e)
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+
+    def flush(self):
+        """Commit the queued writes right away, on the calling thread."""
+        self.commit_writes(self.conn)
+
+    def queue_write(self, process_id: str, row: Optional[Tuple[str, Optional[str]]]):
+        with self.writes_lock:
+            self.pending_writes[process_id] = row
+        self.writes_ready.set()
+
+    def close(self):
+        """Flush the queued writes and stop the writer thread."""
+        with self.writes_lock:
+            self.closing = True
+        self.writes_ready.set()
+        self.writer.join()
+
+    def save_process(self, process: "ProcessStatus", table_path: Optional[str]):
+        self.queue_write(process.process_id, (json.dumps(process.dict(), default=str), table_path))
+
+    def load_process(self, process_id: str) -> Optional[Tuple["ProcessStatus", Optional[str]]]:
+        row = self.conn.execute(
+            "SELECT record, table_path FROM processes WHERE process_id = ?", (process_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return ProcessStatus(**json.loads(row[0])), row[1]
+
+    def delete_process(self, process_id: str):
+        self.queue_write(process_id, None)
+
+    def save_pipeline(self, pipeline: Dict[str, Any]):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pipelines (pipeline_id, owner, record) VALUES (?, ?, ?)",
+            (pipeline["pipeline_id"], self.owner, json.dumps(pipeline))
+        )
+
+    def load_pipeline(self, pipeline_id: str) -> Optional[Dict[str, Any]]:
+        row = self.conn.execute("SELECT record FROM pipelines WHERE pipeline_id = ?", (pipeline_id,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def delete_pipeline(self, pipeline_id: str):
+        self.conn.execute("DELETE FROM pipelines WHERE pipeline_id = ?", (pipeline_id,))
+
+    def request_action(self, process_id: str, action: str) -> bool:
+        """Queue "stop" or "reset" for the worker owning a process; False if it is unknown."""
+        row = self.conn.execute("SELECT owner FROM processes WHERE process_id = ?", (process_id,)).fetchone()
+        if row is None:
+            return False
+        self.conn.execute(
+            "INSERT OR REPLACE INTO actions (process_id, owner, action) VALUES (?, ?, ?)",
+            (process_id, row[0], action)
+        )
+        return True
+
+    def take_actions(self) -> List[Tuple[str, str]]:
+        """Pop the (process_id, action) requests addressed to this worker."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            actions = self.conn.execute(
+                "SELECT process_id, action FROM actions WHERE owner = ?", (self.owner,)
+            ).fetchall()
+            self.conn.execute("DELETE FROM actions WHERE owner = ?", (self.owner,))
+        finally:
+            self.conn.execute("COMMIT")
+        return actions
+
+state_backend = None
+
+def get_state_backend():
+    """State backend of this API worker, opened on first use (never in node workers)."""
+    global state_backend
+    if state_backend is None:
+        if STATE_BACKEND == "sqlite":
+            state_backend = SQLiteStateBackend(STATE_DB_PATH)
+        elif STATE_BACKEND == "memory":
+            state_backend = InMemoryStateBackend()
+        else:
+            raise ValueError(f"Unknown STATE_BACKEND: {STATE_BACKEND}")
+    return state_backend
+
+def save_process_state(process_id: str):
+    """Write a local process to the state backend so other API workers see it."""
+    backend = get_state_backend()
+    if backend.shared:
+        table = process_tables.get(process_id)
+        backend.save_process(processes[process_id], table.path if isinstance(table, MappedNodeTable) else None)
+
+def find_process(process_id: str) -> Optional["ProcessStatus"]:
+    """A process of this API worker, or a read-only copy of another worker's."""
+    process = processes.get(process_id)
+    if process is None:
+        stored = get_state_backend().load_process(process_id)
+        if stored is not None:
+            process = stored[0]
+    return process
+
+def find_pipeline(pipeline_id: str) -> Optional[Dict[str, Any]]:
+    """A pipeline of this API worker, or another worker's as last saved."""
+    return pipelines.get(pipeline_id) or get_state_backend().load_pipeline(pipeline_id)
+
+# Result tables of other API workers' processes opened here, in LRU order
+remote_tables: "OrderedDict[str, MappedNodeTable]" = OrderedDict()
+MAX_REMOTE_TABLES = 16
+
+def find_result_table(process_id: str) -> Optional[NodeTable]:
+    """Result table of a process, mapping another worker's table file if needed."""
+    if process_id in processes:
+        return process_tables.get(process_id)
+    stored = get_state_backend().load_process(process_id)
+    if stored is None or stored[1] is None or stored[0].output_evicted:
+        return None
+    path = stored[1]
+    table = remote_tables.get(path)
+    if table is None:
+        try:
+            table = MappedNodeTable(path, owned=False)
+        except (OSError, ValueError):
+            return None  # Removed by its owner in the meantime
+        remote_tables[path] = table
+        if len(remote_tables) > MAX_REMOTE_TABLES:
+            remote_tables.popitem(last=False)
+    remote_tables.move_to_end(path)
+    return table
+
+async def handle_routed_actions():
+    """Carry out stop/reset requests other API workers queued for our processes."""
+    backend = get_state_backend()
+    while True:
+        await asyncio.sleep(REMOTE_STATE_POLL_SECONDS)
+        for process_id, action in backend.take_actions():
+            if process_id not in processes:
+                continue
+            logger.info("📨 Handling routed %s for %s", action, process_id)
+            if action == "stop":
+                await stop_process(process_id)
+            elif action == "reset":
+                await reset_process(process_id)
+
+action_listener: Optional[asyncio.Task] = None
+
+def complete_from_cache(process_id: str) -> bool:
+    """Complete a process straight from the result cache if its key is cached."""
+    process = processes[process_id]
+    if not process.cache_key or result_cache.max_bytes <= 0:
+        return False
+    cached = result_cache.get(process.cache_key)
+    if cached is None:
+        return False
+    process.output, table, process.output_digest, nbytes, encoded = cached
+    if table is not None:
+        process_tables[process_id] = table
+    if encoded is not None:
+        encoded_outputs[process_id] = encoded
+    process.status = "completed"
+    process.cache_hit = True
+    process.progress = 1.0
+    publish_process_event(process_id)
+    process_registry.track_output(process_id, nbytes)
+    logger.info("⚡ Node %s (Process %s) served from result cache", process.node_id, process_id)
+    return True
+
+# Pipe back to the API process, set only inside node workers
+worker_conn = None
+
+def report_progress(progress: float, message: str):
+    """Report the progress (0.0-1.0) of the node running in this worker."""
+    if worker_conn is not None:
+        worker_conn.send(("progress", (progress, message)))
+
+def node_worker_main(conn):
+    """Entry point of a pre-forked node worker.
+
+    The worker imports this module once at startup and then serves tasks sent
+    over `conn` until it receives None. For each task it reports "running"
+    before starting, any number of "progress" updates, and "completed" or
+    "failed" when done.
+    """
+    global worker_conn
+    worker_conn = conn
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        process_id, node_id, params, previous_outputs = task
+        conn.send(("running", os.getpid()))
+        try:
+            output = process_node(node_id, params, previous_outputs)
+            output, table = split_output_table(output)
+            digest, nbytes = output_fingerprint(output, table)
+            encoded = encode_node_output(process_id, output, table)
+            if table is not None:
+                table = spill_table(table, params.tempFilePath, process_id)
+            conn.send(("completed", (output, table, digest, nbytes, encoded)))
+        except Exception as e:
+            conn.send(("failed", str(e)))
+    shutdown_profile_pool()
+    conn.close()
+
+class NodeWorker:
+    """Handle on one worker process and the parent end of its pipe."""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        # Not daemonic: a node worker may start its own profiling pool
+        # (see aggregate_table), and it exits on EOF if the server goes away
+        self.process = ctx.Process(target=node_worker_main, args=(child_conn,), daemon=False)
+        self.process.start()
+        child_conn.close()
+
+    def terminate(self):
+        self.process.terminate()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self):
+        """Ask an idle worker to exit (shutting down its profiling pool), terminating it if it does not."""
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            logger.warning("⚠️ Node worker %s did not exit, terminating it", self.process.pid)
+        self.terminate()
+
+class TaskManager:
+    """Pre-forked pool of warm node workers with per-task cancellation.
+
+    Workers are started once (with the "spawn" context, so they never inherit
+    the event loop or its threads) and reused for every task. Cancelling the
+    asyncio task awaiting run_node terminates the worker running that node and
+    replaces it with a fresh one, so /stop really stops the computation.
+    """
+
+    def __init__(self, num_workers: int):
+        self.num_workers = num_workers
+        self.ctx = multiprocessing.get_context("spawn")
+        self.idle_workers: List[NodeWorker] = []
+        self.running_workers: Dict[str, NodeWorker] = {}
+        self.retired_workers: List[NodeWorker] = []  # Cancelled during shutdown, see _replace_worker
+        self.waiters: deque = deque()
+
+    def start(self):
+        for _ in range(self.num_workers):
+            self.idle_workers.append(NodeWorker(self.ctx))
+        logger.info("⚙️ Started %s node worker processes", self.num_workers)
+
+    def shutdown(self):
+        """Stop every worker and wait for it to exit.
+
+        Idle workers exit on their own and shut their profiling pools down;
+        busy ones are terminated, and their pool processes follow within a
+        second (see watch_parent_process).
+        """
+        for worker in self.idle_workers:
+            worker.stop()
+        for worker in list(self.running_workers.values()) + self.retired_workers:
+            worker.terminate()
+        self.idle_workers = []
+        self.running_workers = {}
+        self.retired_workers = []
+
+    async def _acquire_worker(self) -> NodeWorker:
+        while not self.idle_workers:
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_next_waiter()  # Pass the free worker on
+                raise
+        return self.idle_workers.pop()
+
+    def _wake_next_waiter(self):
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def _release_worker(self, worker: NodeWorker):
+        self.idle_workers.append(worker)
+        self._wake_next_waiter()
+
+    def _replace_worker(self, worker: NodeWorker):
+        if shutting_down:
+            self.retired_workers.append(worker)  # Terminated and joined by shutdown()
+            return
+        logger.info("🔪 Terminating node worker %s", worker.process.pid)
+        asyncio.get_running_loop().run_in_executor(None, worker.terminate)
+        self._release_worker(NodeWorker(self.ctx))
+
+    async def run_node(self, process_id: str, node_id: str, params: "RunParameters", previous_outputs: Optional[Dict[str, Any]] = None) -> Tuple[Dict, Optional[NodeTable], str, int, Optional[Tuple[bytes, bytes]]]:
+        """Run process_node on a free worker and return (output, table, digest, size in bytes, encoded body)."""
+        worker = await self._acquire_worker()
+        loop = asyncio.get_running_loop()
+        self.running_workers[process_id] = worker
+        try:
+            # Pickling the upstream outputs can take a while: keep it off the event loop
+            await loop.run_in_executor(None, worker.conn.send, (process_id, node_id, params, previous_outputs))
+            while True:
+                status, payload = await loop.run_in_executor(None, worker.conn.recv)
+                if status == "running":
+                    if process_id in processes:
+                        processes[process_id].status = "running"
+                        processes[process_id].worker_pid = payload
+                        publish_process_event(process_id)
+                elif status == "progress":
+                    if process_id in processes:
+                        processes[process_id].progress, processes[process_id].progress_message = payload
+                        publish_process_event(process_id)
+                elif status == "completed":
+                    output, table, digest, nbytes, encoded = payload
+                    if isinstance(table, TableFile):
+                        table = MappedNodeTable(table.path)
+                    return output, table, digest, nbytes, encoded
+                else:
+                    raise NodeExecutionError(payload)
+        except asyncio.CancelledError:
+            self._replace_worker(worker)
+            worker = None
+            raise
+        except (EOFError, OSError):
+            logger.error("❌ Node worker %s exited unexpectedly while running %s", worker.process.pid, process_id)
+            self._replace_worker(worker)
+            worker = None
+            raise NodeExecutionError("Node worker process exited unexpectedly")
+        finally:
+            self.running_workers.pop(process_id, None)
+            if worker is not None:
+                self._release_worker(worker)
+
+class RunScheduler:
+    """Bounded FIFO admission queue in front of process_node_async.
+
+    At most `max_concurrent` runs hold a slot at any time; later runs wait in
+    `queue` (in arrival order) with status "queued". Pipeline nodes that are
+    admitted but still wait for their upstream nodes are counted in `pending`.
+    Callers check `is_full()` and then call `reserve()` in the same step, so
+    a burst of requests can never overbook the queue.
+    """
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.active = 0
+        self.queue: deque = deque()  # (process_id, future) in FIFO order
+        self.pending: set = set()  # Admitted pipeline process_ids not reserved yet
+
+    def has_free_slot(self) -> bool:
+        return self.active < self.max_concurrent and not self.queue
+
+    def is_full(self, extra_runs: int = 1) -> bool:
+        free_slots = max(self.max_concurrent - self.active, 0)
+        return len(self.queue) + len(self.pending) + extra_runs > self.max_queued + free_slots
+
+    def queue_position(self, process_id: str) -> Optional[int]:
+        for position, (queued_id, _) in enumerate(self.queue, start=1):
+            if queued_id == process_id:
+                return position
+        return None
+
+    def reserve(self, process_id: str) -> Optional[asyncio.Future]:
+        """Take a free slot (returns None) or join the queue (the future resolves with a slot)."""
+        self.pending.discard(process_id)
+        if self.has_free_slot():
+            self.active += 1
+            return None
+        waiter = asyncio.get_running_loop().create_future()
+        self.queue.append((process_id, waiter))
+        if process_id in processes:
+            processes[process_id].status = "queued"
+            processes[process_id].queue_position = len(self.queue)
+            publish_process_event(process_id)
+        return waiter
+
+    def finish(self, process_id: str, waiter: Optional[asyncio.Future]):
+        """Give back what reserve() took, once the run is over or was cancelled."""
+        if waiter is None or (waiter.done() and not waiter.cancelled()):
+            self.release()
+            return
+        entry = (process_id, waiter)
+        if entry in self.queue:
+            self.queue.remove(entry)
+            self.update_queue_positions()
+        waiter.cancel()
+
+    def release(self):
+        while self.queue:
+            _, waiter = self.queue.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # Hand the slot over without freeing it
+                self.update_queue_positions()
+                return
+        self.active -= 1
+
+    def update_queue_positions(self):
+        """Store the new place of every waiting process once the queue has moved.
+
+        The position lives on the process record (not only in this scheduler)
+        so that other API workers can report it from the shared state.
+        """
+        for position, (queued_id, _) in enumerate(self.queue, start=1):
+            process = processes.get(queued_id)
+            if process is not None and process.queue_position != position:
+                process.queue_position = position
+                publish_process_event(queued_id)
+
+run_scheduler = RunScheduler(MAX_CONCURRENT_RUNS, MAX_QUEUED_RUNS)
+
+def check_run_admission(extra_runs: int = 1):
+    """Reject the request with 503 + Retry-After when the run queue is full."""
+    if run_scheduler.is_full(extra_runs):
+        logger.warning("🚦 Run queue full (%s queued, %s active), rejecting request", len(run_scheduler.queue), run_scheduler.active)
+        raise HTTPException(
+            status_code=503,
+            detail="Run queue is full, please retry later",
+            headers={"Retry-After": str(RUN_QUEUE_RETRY_AFTER)}
+        )
+
+def mark_running(process_id: str):
+    if process_id in processes:
+        processes[process_id].status = "running"
+        processes[process_id].queue_position = None
+        processes[process_id].start_time = time.time()
+        publish_process_event(process_id)
+
+def schedule_node(process_id: str, node_id: str, params: "RunParameters",
+                  previous_outputs: Optional[Dict[str, Any]] = None) -> asyncio.Task:
+    """Reserve a run slot (or a queue place) now and run the node in a task once it has one.
+
+    The reservation happens before the task first runs, so admission checks
+    and the status returned to the caller are exact even for bursts.
+    """
+    waiter = run_scheduler.reserve(process_id)
+    if waiter is None:
+        mark_running(process_id)
+    task = asyncio.create_task(run_node_in_slot(process_id, node_id, params, previous_outputs, waiter))
+    # A callback rather than try/finally: the task may be cancelled before it ever runs
+    task.add_done_callback(lambda _: run_scheduler.finish(process_id, waiter))
+    return task
+
+async def run_node_in_slot(process_id: str, node_id: str, params: "RunParameters",
+                           previous_outputs: Optional[Dict[str, Any]], waiter: Optional[asyncio.Future]):
+    if waiter is not None:
+        await waiter  # The slot is handed over by release()
+        mark_running(process_id)
+    await process_node_async(process_id, node_id, params, previous_outputs)
+
+task_manager: Optional[TaskManager] = None
+# Set by shutdown_event; node workers are never started again after that
+shutting_down = False
+
+def get_task_manager() -> TaskManager:
+    """Return the shared TaskManager, pre-forking its workers on first use."""
+    global task_manager
+    if shutting_down:
+        raise NodeExecutionError("Server is shutting down")
+    if task_manager is None:
+        task_manager = TaskManager(NODE_WORKER_PROCESSES)
+        task_manager.start()
+    return task_manager
+
+@app.get("/")
+def read_root():
+    return {"message": "Welcome to the Long-Running Calculator API"}
+
+def resolve_output_ref(ref: str) -> Tuple[Dict, Optional[NodeTable], str]:
+    """(output, result table, digest) of a stored upstream output, by process_id or output digest."""
+    process = find_process(ref)
+    if process is None:
+        process = next((p for p in processes.values() if p.output_digest == ref and p.output is not None), None)
+    if process is not None and not process.output_evicted:
+        if process.status != "completed" or process.output is None:
+            raise HTTPException(status_code=409, detail=f"Upstream process {ref} has no output (status: {process.status})")
+        process_registry.touch(process.process_id)
+        return process.output, find_result_table(process.process_id), process.output_digest
+    # Evicted or expired processes may still have their output in the result cache
+    digest = process.output_digest if process is not None else ref
+    for output, table, cached_digest, _, _ in result_cache.entries.values():
+        if cached_digest == digest:
+            return output, table, cached_digest
+    if process is not None:
+        raise HTTPException(status_code=410, detail=f"Upstream output {ref}: {OUTPUT_EVICTED_DETAIL}")
+    raise HTTPException(status_code=404, detail=f"Upstream output not found: {ref}")
+
+@app.post("/run/{node_id}")
+async def run_node(node_id: str, input_data: CalculationInput):
+    check_run_admission()
+    process_id = f"{node_id}_{int(time.time() * 1000)}_{uuid.uuid4().hex[:6]}"
+    
+    logger.info("📝 Received calculation request for node %s - Process ID: %s", node_id, process_id)
+    logger.info("📋 Parameters received:")
+    for key, value in input_data.parameters.dict().items():
+        logger.info("  - %s: %s", key, value)
+    
+    if input_data.previousOutputs:
+        logger.info("📋 Previous outputs received:")
+        for upstream_id, output in input_data.previousOutputs.items():
+            logger.info("  - From node %s: %s", upstream_id, LogPayload(output))
+    
+    previous_outputs = dict(input_data.previousOutputs or {})
+    upstream_digests = {
+        upstream_id: output_fingerprint(output)[0]
+        for upstream_id, output in previous_outputs.items()
+    }
+    if input_data.previousOutputRefs:
+        logger.info("📋 Previous output references received:")
+        upstreams = {}
+        for upstream_id, ref in input_data.previousOutputRefs.items():
+            logger.info("  - From node %s: %s", upstream_id, ref)
+            output, table, upstream_digests[upstream_id] = resolve_output_ref(ref)
+            upstreams[upstream_id] = (output, table)
+        previous_outputs.update(await upstream_previews(upstreams))
+    
+    # Store initial process state
+    processes[process_id] = ProcessStatus(
+        process_id=process_id,
+        status="queued",
+        node_id=node_id,
+        start_time=time.time(),
+        parameters=input_data.parameters.dict(),
+        cache_key=compute_cache_key(node_id, input_data.parameters, upstream_digests)
+    )
+    save_process_state(process_id)
+    get_state_backend().flush()  # Visible to every worker before the id is returned
+    
+    if complete_from_cache(process_id):
+        return {
+            "process_id": process_id,
+            "status": "completed",
+            "message": f"Node {node_id} served from result cache"
+        }
+    
+    # Start the node processing in the background
+    tasks[process_id] = schedule_node(process_id, node_id, input_data.parameters, previous_outputs or None)
+    
+    return {
+        "process_id": process_id,
+        "status": processes[process_id].status,
+        "queue_position": run_scheduler.queue_position(process_id),
+        "message": f"Node {node_id} processing started"
+    }
+
+@app.get("/status/{process_id}")
+async def get_status(process_id: str):
+    process = find_process(process_id)
+    if process is None:
+        raise HTTPException(status_code=404, detail="Process not found")
+    
+    # The output itself is served separately by /output/{process_id}
+    return {
+        **process_snapshot(process),
+        "parameters": process.parameters
+    }
+
+@app.get("/output/{process_id}")
+async def get_output(process_id: str, request: Request,
+                     output_format: Literal["json", "columnar"] = Query("json", alias="format")):
+    process = find_process(process_id)
+    if process is None:
+        raise HTTPException(status_code=404, detail="Process not found")
+    if process.output_evicted:
+        raise HTTPException(status_code=410, detail=OUTPUT_EVICTED_DETAIL)
+    if process.output is None:
+        raise HTTPException(status_code=409, detail=f"Process has no output yet (status: {process.status})")
+    
+    # Every representation (content coding or format) gets its own strong ETag
+    use_gzip = output_format == "json" and accepts_gzip(request)
+    if output_format == "columnar":
+        etag = f'"{process.output_digest}-columnar"'
+    else:
+        etag = f'"{process.output_digest}-gz"' if use_gzip else f'"{process.output_digest}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept-Encoding"})
+    
+    if output_format == "columnar":
+        # Output fields in the header, the table preview as columns
+        table = find_result_table(process_id)
+        process_registry.touch(process_id)
+        headers = table.headers if table is not None else []
+        columns = table.window_columns(0, FRONTEND_ROWS_LIMIT, table.column_indices()) if table is not None else []
+        return Response(content=encode_columnar(headers, columns, process.output), media_type=COLUMNAR_MEDIA_TYPE,
+                        headers={"ETag": etag, "Cache-Control": "no-cache"})
+    
+    body, gzipped = encoded_output(process_id)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if use_gzip:
+        body = gzipped
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def batch_status(process_ids: List[str], include_output: bool) -> Response:
+    """{"statuses": {process_id: snapshot}, "not_found": [...]}, splicing in pre-encoded outputs."""
+    statuses = []
+    not_found = []
+    for process_id in dict.fromkeys(process_ids):
+        process = find_process(process_id)
+        if process is None:
+            not_found.append(process_id)
+            continue
+        entry = json_bytes(process_snapshot(process))
+        if include_output:
+            entry = entry[:-1] + b',"output":' + encoded_output(process_id)[0] + b"}"
+        statuses.append(json_bytes(process_id) + b":" + entry)
+    body = b'{"statuses":{' + b",".join(statuses) + b'},"not_found":' + json_bytes(not_found) + b"}"
+    return Response(content=body, media_type="application/json")
+
+@app.post("/status/batch")
+async def get_status_batch(input_data: BatchStatusInput):
+    return batch_status(input_data.process_ids, input_data.include_output)
+
+@app.get("/status")
+async def get_status_many(ids: str = Query(..., description="Comma-separated process ids"), include_output: bool = False):
+    return batch_status([process_id for process_id in ids.split(",") if process_id], include_output)
+
+OUTPUT_EVICTED_DETAIL = "Process output was evicted to stay within the memory budget; run the node again"
+
+def get_result_table(process_id: str) -> NodeTable:
+    """Result table of a process, or the HTTPException explaining why there is none."""
+    process = find_process(process_id)
+    if process is None:
+        raise HTTPException(status_code=404, detail="Process not found")
+    if process.output_evicted:
+        raise HTTPException(status_code=410, detail=OUTPUT_EVICTED_DETAIL)
+    table = find_result_table(process_id)
+    if table is None:
+        raise HTTPException(status_code=409, detail=f"Process has no result table (status: {process.status})")
+    process_registry.touch(process_id)
+    return table
+
+async def table_view(table: NodeTable, filter_model: Dict[str, Any], sort_model: List[Tuple[str, bool]]) -> Optional[array]:
+    """NodeTable.view on a worker thread: its filters and sorts run per row in Python."""
+    return await asyncio.get_running_loop().run_in_executor(None, table.view, filter_model, sort_model)
+
+@app.get("/output/{process_id}/rows")
+async def get_output_rows(
+    process_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=MAX_ROWS_PAGE_SIZE),
+    columns: Optional[str] = Query(None, description="Comma-separated column names"),
+    filter_model: Optional[str] = Query(None, alias="filter", description="AG Grid filter model as JSON"),
+    sort: Optional[str] = Query(None, description="Sort keys, e.g. col_1:asc,col_2:desc"),
+    output_format: Literal["json", "columnar"] = Query("json", alias="format")
+):
+    table = get_result_table(process_id)
+    selected_columns = [column for column in columns.split(",") if column] if columns else None
+    try:
+        column_indices = table.column_indices(selected_columns)
+        row_indices = await table_view(table, parse_filter_model(filter_model), parse_sort_model(sort))
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    
+    page = {
+        "process_id": process_id,
+        "headers": [table.headers[idx] for idx in column_indices],
+        "offset": offset,
+        "limit": limit,
+        "total_rows": table.num_rows,
+        "filtered_rows": table.num_rows if row_indices is None else len(row_indices),
+    }
+    if output_format == "columnar":
+        columns = table.window_columns(offset, limit, column_indices, row_indices)
+        return Response(content=encode_columnar(page.pop("headers"), columns, page), media_type=COLUMNAR_MEDIA_TYPE)
+    return {**page, "rows": table.window(offset, limit, column_indices, row_indices)}
+
+@app.get("/output/{process_id}/export.csv")
+async def export_output_csv(
+    process_id: str,
+    columns: Optional[str] = Query(None, description="Comma-separated column names"),
+    filter_model: Optional[str] = Query(None, alias="filter", description="AG Grid filter model as JSON"),
+    sort: Optional[str] = Query(None, description="Sort keys, e.g. col_1:asc,col_2:desc")
+):
+    table = get_result_table(process_id)
+    selected_columns = [column for column in columns.split(",") if column] if columns else None
+    try:
+        column_indices = table.column_indices(selected_columns)
+        row_indices = await table_view(table, parse_filter_model(filter_model), parse_sort_model(sort))
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+    
+    suffix = "_filtered" if row_indices is not None else ""
+    filename = f"{find_process(process_id).node_id}{suffix}.csv"
+    return StreamingResponse(
+        table.iter_csv(column_indices, row_indices),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+async def route_action(process_id: str, action: str) -> Optional["ProcessStatus"]:
+    """Have the API worker owning `process_id` stop or reset it, and wait for the result.
+
+    Returns the process as last seen (None once it is gone), or raises 404
+    if no worker knows it.
+    """
+    backend = get_state_backend()
+    if not backend.request_action(process_id, action):
+        raise HTTPException(status_code=404, detail="Process not found")
+    deadline = time.time() + STOP_WAIT_SECONDS
+    while True:
+        await asyncio.sleep(REMOTE_STATE_POLL_SECONDS)
+        process = find_process(process_id)
+        if process is None or process.status in TERMINAL_STATUSES or time.time() > deadline:
+            return process
+
+@app.post("/stop/{process_id}")
+async def stop_process(process_id: str):
+    if process_id not in processes:
+        process = await route_action(process_id, "stop")
+        return {
+            "process_id": process_id,
+            "status": process.status if process is not None else "reset",
+            "message": "Process stopped" if process is None or process.status in TERMINAL_STATUSES
+            else "Stop requested from the owning worker"
+        }
+    
+    if process_id in tasks and not tasks[process_id].done():
+        tasks[process_id].cancel()
+        try:
+            await tasks[process_id]
+        except asyncio.CancelledError:
+            processes[process_id].status = "stopped"
+            processes[process_id].error = "Process stopped by user"
+            publish_process_event(process_id)
+        
+        del tasks[process_id]
+        
+    return {
+        "process_id": process_id,
+        "status": processes[process_id].status,
+        "message": "Process stopped"
+    }
+
+@app.post("/reset/{process_id}")
+async def reset_process(process_id: str):
+    if process_id in processes:
+        if process_id in tasks and not tasks[process_id].done():
+            tasks[process_id].cancel()
+            try:
+                await tasks[process_id]
+            except asyncio.CancelledError:
+                pass
+            del tasks[process_id]
+        
+        publish_process_event(process_id, {**process_snapshot(processes[process_id]), "status": "reset"})
+        remove_process(process_id)
+    elif find_process(process_id) is not None:
+        await route_action(process_id, "reset")
+    
+    return {
+        "message": "Process reset successfully",
+        "process_id": process_id
+    }
+
+def resolve_pipeline_nodes(target_node: NodeType) -> List[NodeType]:
+    """Return the target node and all of its upstream nodes in topological order."""
+    order: List[NodeType] = []
+    visited = set()
+
+    def visit(node: NodeType):
+        if node in visited:
+            return
+        visited.add(node)
+        for dep in NODE_DEPENDENCIES[node]:
+            visit(dep)
+        order.append(node)
+
+    visit(target_node)
+    return order
+
+def get_upstream_nodes(node: NodeType) -> List[NodeType]:
+    """Return every transitive upstream node of `node` (excluding itself)."""
+    return [n for n in resolve_pipeline_nodes(node) if n != node]
+
+@app.post("/pipeline/run")
+async def run_pipeline(input_data: PipelineRunInput):
+    target_node = input_data.targetNode
+    started_at = f"{int(time.time() * 1000)}_{uuid.uuid4().hex[:6]}"
+    pipeline_id = f"pipeline_{target_node.value}_{started_at}"
+    node_order = resolve_pipeline_nodes(target_node)
+    check_run_admission(len(node_order))
+
+    logger.info("📝 Received pipeline request for target %s - Pipeline ID: %s", target_node.value, pipeline_id)
+    logger.info("📋 Resolved %s nodes: %s", len(node_order), [n.value for n in node_order])
+
+    # Register every node up front so clients can poll /status immediately
+    process_ids: Dict[str, str] = {}
+    for node in node_order:
+        process_id = f"{node.value}_{started_at}"
+        process_ids[node.value] = process_id
+        processes[process_id] = ProcessStatus(
+            process_id=process_id,
+            status="pending",
+            node_id=node.value,
+            start_time=time.time(),
+            parameters=input_data.parameters.dict()
+        )
+        save_process_state(process_id)
+    get_state_backend().flush()  # Visible to every worker before the ids are returned
+    # Counted against the run queue until each node reserves its slot
+    run_scheduler.pending.update(process_ids.values())
+
+    pipelines[pipeline_id] = {
+        "pipeline_id": pipeline_id,
+        "target_node": target_node.value,
+        "process_ids": process_ids,
+        "start_time": time.time(),
+        "end_time": None,
+    }
+    get_state_backend().save_pipeline(pipelines[pipeline_id])
+
+    task = asyncio.create_task(run_pipeline_async(pipeline_id, node_order, input_data.parameters))
+    task.add_done_callback(lambda _: run_scheduler.pending.difference_update(process_ids.values()))
+    tasks[pipeline_id] = task
+
+    return {
+        "pipeline_id": pipeline_id,
+        "status": "running",
+        "process_ids": process_ids,
+        "message": f"Pipeline for {target_node.value} started with {len(node_order)} nodes"
+    }
+
+@app.get("/pipeline/status/{pipeline_id}")
+async def get_pipeline_status(pipeline_id: str):
+    pipeline = find_pipeline(pipeline_id)
+    if pipeline is None:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+
+    node_statuses = {}
+    for node_id, process_id in pipeline["process_ids"].items():
+        process = find_process(process_id)
+        node_statuses[node_id] = process.status if process is not None else "reset"
+    end_time = pipeline["end_time"] or time.time()
+
+    return {
+        "pipeline_id": pipeline_id,
+        "target_node": pipeline["target_node"],
+        "status": node_statuses[pipeline["target_node"]],
+        "nodes": node_statuses,
+        "process_ids": pipeline["process_ids"],
+        "elapsed_time": f"{end_time - pipeline['start_time']:.2f} seconds"
+    }
+
+@app.get("/events/{process_id}")
+async def process_events(process_id: str):
+    if find_process(process_id) is None:
+        raise HTTPException(status_code=404, detail="Process not found")
+    return StreamingResponse(
+        stream_process_events([process_id]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/pipeline/events/{pipeline_id}")
+async def pipeline_events(pipeline_id: str):
+    pipeline = find_pipeline(pipeline_id)
+    if pipeline is None:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+    return StreamingResponse(
+        stream_process_events(list(pipeline["process_ids"].values())),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def run_pipeline_async(pipeline_id: str, node_order: List[NodeType], params: RunParameters):
+    """Run every node of a pipeline, starting each one as soon as its dependencies finish.
+
+    Independent branches (e.g. the SRC and TGT chains) therefore run concurrently.
+    Each node still goes through process_node_async and gets its own entry in
+    `tasks`, so /stop and /reset work on individual pipeline nodes.
+    """
+    process_ids = pipelines[pipeline_id]["process_ids"]
+    node_tasks: Dict[NodeType, asyncio.Task] = {}
+
+    async def run_pipeline_node(node: NodeType):
+        deps = NODE_DEPENDENCIES[node]
+        if deps:
+            # asyncio.wait (unlike gather) does not propagate a stopped dependency's cancellation
+            await asyncio.wait([node_tasks[dep] for dep in deps])
+
+        process_id = process_ids[node.value]
+        if process_id not in processes:
+            return  # Node was reset while waiting
+
+        for dep in deps:
+            dep_process = processes.get(process_ids[dep.value])
+            if dep_process is None or dep_process.status != "completed":
+                dep_status = dep_process.status if dep_process else "reset"
+                logger.info("⏭️ Skipping node %s: upstream node %s is %s", node.value, dep.value, dep_status)
+                processes[process_id].status = "stopped"
+                processes[process_id].error = f"Upstream node {dep.value} did not complete ({dep_status})"
+                publish_process_event(process_id)
+                return
+
+        upstream_nodes = get_upstream_nodes(node)
+        processes[process_id].cache_key = compute_cache_key(node.value, params, {
+            upstream.value: processes[process_ids[upstream.value]].output_digest
+            for upstream in upstream_nodes
+        })
+        if complete_from_cache(process_id):
+            return
+
+        # Handlers only read their direct dependencies' outputs
+        for dep in deps:
+            process_registry.touch(process_ids[dep.value])
+        previous_outputs = await upstream_previews({
+            dep.value: (processes[process_ids[dep.value]].output, process_tables.get(process_ids[dep.value]))
+            for dep in deps
+        })
+        if process_id not in processes:
+            return  # Node was reset meanwhile
+        await schedule_node(process_id, node.value, params, previous_outputs)
+
+    for node in node_order:
+        task = asyncio.create_task(run_pipeline_node(node))
+        # Skipped, reset or cached nodes never reserve a slot
+        task.add_done_callback(lambda _, process_id=process_ids[node.value]: run_scheduler.pending.discard(process_id))
+        node_tasks[node] = task
+        tasks[process_ids[node.value]] = task
+
+    try:
+        await asyncio.wait(list(node_tasks.values()))
+    except asyncio.CancelledError:
+        logger.info("🛑 Pipeline %s was cancelled", pipeline_id)
+        for task in node_tasks.values():
+            task.cancel()
+        raise
+    finally:
+        pipelines[pipeline_id]["end_time"] = time.time()
+        get_state_backend().save_pipeline(pipelines[pipeline_id])
+
+    logger.info("[END] Pipeline %s finished in %.2f seconds", pipeline_id, pipelines[pipeline_id]['end_time'] - pipelines[pipeline_id]['start_time'])
+
+async def process_node_async(process_id: str, node_id: str, params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None):
+    run_started = time.perf_counter()
+    try:
+        logger.info("[START] Node %s (Process %s) started at %s", node_id, process_id, datetime.now().isoformat())
+        if SIMULATED_NODE_DELAY_SECONDS > 0:
+            await asyncio.sleep(SIMULATED_NODE_DELAY_SECONDS)
+        output, table, digest, nbytes, encoded = await get_task_manager().run_node(process_id, node_id, params, previous_outputs)
+        processes[process_id].status = "completed"
+        processes[process_id].output = output
+        processes[process_id].output_digest = digest
+        if table is not None:
+            process_tables[process_id] = table
+        if encoded is not None:
+            encoded_outputs[process_id] = encoded
+        processes[process_id].progress = 1.0
+        if processes[process_id].cache_key and result_cache.max_bytes > 0:
+            result_cache.put(processes[process_id].cache_key, output, table, digest, nbytes, encoded)
+        publish_process_event(process_id)
+        process_registry.track_output(process_id, nbytes)
+        logger.info("[END] Node %s (Process %s) completed at %s", node_id, process_id, datetime.now().isoformat())
+        logger.info("📤 Output: %s", LogPayload(output))
+    except asyncio.CancelledError:
+        logger.info("🛑 Node %s (Process %s) was cancelled", node_id, process_id)
+        processes[process_id].status = "stopped"
+        processes[process_id].error = "Process stopped by user"
+        publish_process_event(process_id)
+        raise  # Re-raise the cancellation
+    except Exception as e:
+        logger.error("❌ Error processing node %s: %s", node_id, e)
+        processes[process_id].status = "failed"
+        processes[process_id].error = str(e)
+        # Create error output with fail_message
+        error_output = {
+            "status": "failed",
+            "run_parameters": params.dict(),
+            "execution_logs": [
+                f"Starting processing at {datetime.now().isoformat()}",
+                f"Processing with environment: {params.runEnv}",
+                f"Processing failed at {datetime.now().isoformat()}"
+            ],
+            "calculation_results": {
+                "processed_at": datetime.now().isoformat(),
+                "environment": params.runEnv,
+                "error_occurred": True
+            },
+            'histogram_data': [],
+            'count': '0',
+            'fail_message': str(e)
+        }
+        processes[process_id].output = error_output
+        processes[process_id].output_digest, error_nbytes = output_fingerprint(error_output)
+        encoded = encode_node_output(process_id, error_output, None)  # A few hundred bytes
+        if encoded is not None:
+            encoded_outputs[process_id] = encoded
+        publish_process_event(process_id)
+        process_registry.track_output(process_id, error_nbytes)
+    finally:
+        process = processes.get(process_id)
+        node_run_duration.observe(time.perf_counter() - run_started, node_type_label(node_id),
+                                  process.status if process is not None else "reset")
+
+def process_node(node_id: str, params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+    """Main node processing function that routes to specific node handlers.
+    
+    Currently all nodes use the enhanced generic node processor for consistent
+    data generation and analysis.
+    
+    Runs inside a TaskManager worker process, so it must stay a plain
+    (non-async) function whose arguments and result are picklable.
+
+    Handlers draw only from a random.Random seeded with params.seed (see
+    run_seed) and put no wall-clock values in their output, so identical
+    inputs yield byte-identical outputs.
+    """
+    seed = run_seed(node_id, params)
+    params = params.model_copy(update={"seed": seed})
+    rng = random.Random(seed)
+    logger.info("🎯 Processing node: %s (seed %s)", node_id, seed)
+    
+    # Test case: Simulate failure for specific node or parameter
+    if params.runEnv == "TEST_FAILURE" or node_id == "test_failure_node":
+        raise Exception("Test failure: This is a simulated error for testing the failed node functionality. The node encountered a critical error during data processing.")
+    
+    # Always return a large random table for all nodes using enhanced processor
+    return process_generic_node(params, rng)
+
+def run_seed(node_id: str, params: RunParameters) -> int:
+    """params.seed, or a 64-bit seed hashed from node_id and the other parameters.
+
+    profileMode is left out: it only changes how a table is profiled, so exact
+    and sketch runs of the same parameters profile the same table.
+    """
+    if params.seed is not None:
+        return params.seed
+    payload = json.dumps([node_id, params.model_dump(exclude={"seed", "profileMode"})], sort_keys=True, default=str)
+    return int.from_bytes(hashlib.sha256(payload.encode()).digest()[:8], "big")
+
+def profile_numeric_column(column_name: str, values: Sequence[float], bins: int = 10) -> Dict:
+    """Histogram entry for a numeric column (see NumericColumnStats)."""
+    stats = NumericColumnStats()
+    stats.update(values)
+    return stats.profile(column_name, bins)
+
+def profile_text_column(column_name: str, values: Sequence[str], top_k: int = 10) -> Dict:
+    """Histogram entry for a text column: value frequencies and length summary."""
+    stats = TextColumnStats()
+    stats.update(values)
+    return stats.profile(column_name, top_k)
+
+def numeric_profile_entry(column_name: str, moments: "RunningMoments", unique_values: int, median,
+                          bin_edges: List[float], bin_counts: List[int]) -> Dict:
+    """Histogram entry dict shared by the exact and sketched numeric profiles."""
+    if moments.count == 0:
+        return {
+            'column_name': column_name,
+            'data_type': 'numeric',
+            'total_values': 0,
+            'unique_values': 0,
+            'summary': {},
+            'distribution': {'bins': 0, 'bin_edges': [], 'bin_counts': []}
+        }
+    return {
+        'column_name': column_name,
+        'data_type': 'numeric',
+        'total_values': moments.count,
+        'unique_values': unique_values,
+        'summary': {
+            'min': moments.minimum,
+            'max': moments.maximum,
+            'mean': moments.mean,
+            'median': median,
+            'std_dev': moments.std_dev
+        },
+        'distribution': {
+            'bins': len(bin_counts),
+            'bin_edges': bin_edges,
+            'bin_counts': bin_counts
+        }
+    }
+
+def text_profile_entry(column_name: str, count: int, unique_values: int, top_values: List[Tuple[str, int]],
+                       min_length: int, max_length: int, total_length: int) -> Dict:
+    """Histogram entry dict shared by the exact and sketched text profiles."""
+    if count == 0:
+        return {
+            'column_name': column_name,
+            'data_type': 'text',
+            'total_values': 0,
+            'unique_values': 0,
+            'top_values': [],
+            'summary': {}
+        }
+    return {
+        'column_name': column_name,
+        'data_type': 'text',
+        'total_values': count,
+        'unique_values': unique_values,
+        'top_values': [{'value': str(value), 'count': value_count} for value, value_count in top_values],
+        'summary': {
+            'min_length': min_length,
+            'max_length': max_length,
+            'avg_length': total_length / count
+        }
+    }
+
+def numeric_array(values: Sequence[float]):
+    """NumPy view of a numeric column (zero-copy for 'q'/'d' arrays)."""
+    if isinstance(values, array) and values.typecode in ('q', 'd'):
+        return np.frombuffer(values, dtype=np.int64 if values.typecode == 'q' else np.float64)
+    return np.asarray(values, dtype=np.float64)
+
+class RunningMoments:
+    """Mergeable count, mean, M2 (sum of squared deviations), min and max.
+
+    A chunk is summarised in one NumPy pass or one Welford pass, and chunks
+    are combined with Chan et al.'s parallel formula, so the merged mean and
+    std_dev match a single pass over all rows up to float rounding.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    @property
+    def std_dev(self) -> float:
+        return (self.m2 / self.count) ** 0.5 if self.count else 0.0
+
+    def update(self, values: Sequence[float]):
+        if len(values) == 0:
+            return
+        if np is not None:
+            data = numeric_array(values)
+            count, mean = len(data), float(data.mean())
+            self._combine(count, mean, float(data.var()) * count, data.min().item(), data.max().item())
+            return
+        # Welford's online algorithm: numerically stable mean and variance
+        count, mean, m2 = 0, 0.0, 0.0
+        for x in values:
+            count += 1
+            delta = x - mean
+            mean += delta / count
+            m2 += delta * (x - mean)
+        self._combine(count, mean, m2, min(values), max(values))
+
+    def merge(self, other: "RunningMoments"):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2, other.minimum, other.maximum)
+
+    def _combine(self, count: int, mean: float, m2: float, minimum, maximum):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.minimum = minimum if self.minimum is None else min(self.minimum, minimum)
+        self.maximum = maximum if self.maximum is None else max(self.maximum, maximum)
+
+def equal_width_edges(minimum, maximum, bins: int) -> List[float]:
+    span = maximum - minimum
+    return [minimum + i * span / bins for i in range(bins + 1)]
+
+class NumericColumnStats:
+    """Exact, mergeable aggregates of a numeric column.
+
+    Keeps RunningMoments plus a value -> count table, from which the distinct
+    count, median (upper middle value) and bin counts are derived once all
+    chunks are merged. Bins have equal width and the last bin is closed, so
+    the maximum is always counted. Profiling a column in row chunks and
+    merging gives the same entry as profiling it in one go.
+    """
+
+    def __init__(self):
+        self.moments = RunningMoments()
+        self.value_counts = Counter()
+
+    def update(self, values: Sequence[float]):
+        if len(values) == 0:
+            return
+        self.moments.update(values)
+        if np is not None:
+            # np.unique sorts in C; only the distinct values become Python objects
+            keys, counts = np.unique(numeric_array(values), return_counts=True)
+            self.value_counts.update(dict(zip(keys.tolist(), counts.tolist())))
+        else:
+            self.value_counts.update(values)
+
+    def merge(self, other: "NumericColumnStats"):
+        self.moments.merge(other.moments)
+        self.value_counts.update(other.value_counts)
+
+    def profile(self, column_name: str, bins: int = 10) -> Dict:
+        count = self.moments.count
+        if count == 0:
+            return numeric_profile_entry(column_name, self.moments, 0, None, [], [])
+        bins = max(1, bins)
+        keys = sorted(self.value_counts)
+        cumulative = list(accumulate(self.value_counts[key] for key in keys))
+        median = keys[bisect_right(cumulative, count // 2)]
+        bin_edges = equal_width_edges(keys[0], keys[-1], bins)
+        if keys[0] == keys[-1]:
+            bin_counts = [count] + [0] * (bins - 1)
+        else:
+            # Rows below each interior edge, read off the cumulative counts
+            below = [cumulative[position - 1] if position else 0
+                     for position in (bisect_left(keys, edge) for edge in bin_edges[1:-1])]
+            positions = [0] + below + [count]
+            bin_counts = [positions[i + 1] - positions[i] for i in range(bins)]
+        return numeric_profile_entry(column_name, self.moments, len(keys), median, bin_edges, bin_counts)
+
+class TextColumnStats:
+    """Exact, mergeable aggregates of a text column: value counts and length summary."""
+
+    def __init__(self):
+        self.value_counts = Counter()
+
+    def update(self, values: Sequence[str]):
+        self.value_counts.update(values)
+
+    def merge(self, other: "TextColumnStats"):
+        self.value_counts.update(other.value_counts)
+
+    def profile(self, column_name: str, top_k: int = 10) -> Dict:
+        count = sum(self.value_counts.values())
+        lengths = [(len(str(value)), value_count) for value, value_count in self.value_counts.items()]
+        return text_profile_entry(
+            column_name, count, len(self.value_counts), self.value_counts.most_common(top_k),
+            min((length for length, _ in lengths), default=0),
+            max((length for length, _ in lengths), default=0),
+            sum(length * value_count for length, value_count in lengths)
+        )
+
+MASK64 = (1 << 64) - 1
+
+def splitmix64(value: int) -> int:
+    """SplitMix64 finalizer: scrambles a 64-bit integer into a well-mixed hash."""
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+def stable_hash64(value: Any) -> int:
+    """64-bit hash of a cell value that is the same in every process.
+
+    The builtin hash() is salted per process for strings, which would make
+    sketches built in different workers impossible to merge.
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        return splitmix64(value & MASK64)
+    if isinstance(value, float):
+        return splitmix64(struct.unpack('<Q', struct.pack('<d', value))[0])
+    return int.from_bytes(hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'little')
+
+class HyperLogLog:
+    """Distinct-count sketch (Flajolet et al., 2007) with 2**precision one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2**precision), i.e.
+    ~1.6% at the default precision of 12 (4 KiB per column), with linear
+    counting taking over for small cardinalities. Merging keeps the
+    register-wise maximum, so a merged sketch is identical to one built over
+    the concatenated input.
+    """
+
+    def __init__(self, precision: int = SKETCH_HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add_hash(self, hashed: int):
+        index = hashed >> (64 - self.precision)
+        rank = 64 - self.precision - (hashed & ((1 << (64 - self.precision)) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable):
+        if np is not None and isinstance(values, array) and values.typecode == 'q':
+            self._update_int64(np.frombuffer(values, dtype=np.int64))
+            return
+        for value in values:
+            self.add_hash(stable_hash64(value))
+
+    def _update_int64(self, data):
+        # Vectorized stable_hash64/add_hash for int64 columns
+        hashed = data.astype(np.uint64)
+        with np.errstate(over='ignore'):
+            hashed = hashed + np.uint64(0x9E3779B97F4A7C15)
+            hashed = (hashed ^ (hashed >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            hashed = (hashed ^ (hashed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            hashed = hashed ^ (hashed >> np.uint64(31))
+        suffix_bits = 64 - self.precision
+        indices = (hashed >> np.uint64(suffix_bits)).astype(np.intp)
+        # frexp's exponent is the bit length of the suffix (exact for suffixes under 2**53)
+        _, bit_lengths = np.frexp((hashed & np.uint64((1 << suffix_bits) - 1)).astype(np.float64))
+        ranks = (suffix_bits + 1 - bit_lengths).astype(np.uint8)
+        np.maximum.at(np.frombuffer(self.registers, dtype=np.uint8), indices, ranks)
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+class KLLSketch:
+    """Quantile sketch (Karnin, Lang & Liberty, 2016) over numeric values.
+
+    Level h holds items that each stand for 2**h inputs. When a level
+    outgrows its capacity (k at the top, shrinking by 2/3 per level below)
+    it is sorted and every other item, from a random offset, is promoted.
+    With the default k=200 the rank error is about 1.65% of the input size
+    at 99% confidence and the sketch holds roughly 3k items however large
+    the input. Sketches merge by concatenating levels and compacting again.
+    The offsets come from a fixed-seed generator, so a given input always
+    yields the same sketch.
+    """
+
+    def __init__(self, k: int = SKETCH_KLL_K, seed: int = 0):
+        self.k = k
+        self.levels: List[list] = [[]]
+        self.count = 0
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values: Iterable[float]):
+        items = values.tolist() if isinstance(values, array) else list(values)
+        self.count += len(items)
+        # Feeding k items at a time keeps the lower levels populated; one
+        # bulk extend would push everything to the top level in one go
+        for start in range(0, len(items), self.k):
+            self.levels[0].extend(items[start:start + self.k])
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+
+    def _compress(self):
+        while True:
+            for level, items in enumerate(self.levels):
+                if len(items) > self._capacity(level):
+                    break
+            else:
+                return
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            items = sorted(items)
+            # An odd item stays behind so total weight always equals count
+            self.levels[level] = [items.pop()] if len(items) % 2 else []
+            self.levels[level + 1].extend(items[self._rng.getrandbits(1)::2])
+
+    def _weighted_items(self) -> Tuple[list, list]:
+        """Sorted items with the running count of inputs at or below each."""
+        pairs = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        values, cumulative, total = [], [], 0
+        for value, weight in pairs:
+            total += weight
+            values.append(value)
+            cumulative.append(total)
+        return values, cumulative
+
+    def quantiles(self, fractions: Sequence[float]) -> list:
+        """Approximate value at each rank fraction (0.5 is the upper median)."""
+        values, cumulative = self._weighted_items()
+        if not values:
+            return [None] * len(fractions)
+        results = []
+        for fraction in fractions:
+            position = bisect_left(cumulative, int(fraction * self.count) + 1)
+            results.append(values[min(position, len(values) - 1)])
+        return results
+
+    def ranks(self, points: Sequence[float]) -> List[int]:
+        """Approximate number of inputs strictly below each point."""
+        values, cumulative = self._weighted_items()
+        ranks = []
+        for point in points:
+            position = bisect_left(values, point)
+            ranks.append(cumulative[position - 1] if position else 0)
+        return ranks
+
+class SpaceSaving:
+    """Heavy-hitter sketch (Metwally et al., 2005) keeping at most `capacity` counters.
+
+    Reported counts never under-estimate and over-estimate by at most
+    n / capacity (n = values seen), so every value occurring more than
+    n / capacity times is tracked. Values are folded in per batch and
+    sketches are combined with the mergeable-summary rule (Agarwal et al.,
+    2012): a value missing from a full summary is credited with that
+    summary's smallest count, which keeps the same bound.
+    """
 
-@app.post("/reset/{process_id}")
-async def reset_process(process_id: str):
-    if process_id in processes:
-        if process_id in tasks and not tasks[process_id].done():
-            tasks[process_id].cancel()
-            try:
-                await tasks[process_id]
-            except asyncio.CancelledError:
-                pass
-            del tasks[process_id]
-        
-        del processes[process_id]
-    
-    return {
-        "message": "Process reset successfully",
-        "process_id": process_id
-    }
+    BATCH_SIZE = 65536
 
-async def process_node_async(process_id: str, node_id: str, params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None):
-    try:
-        logger.info(f"[START] Node {node_id} (Process {process_id}) started at {datetime.now().isoformat()}")
-        # Simulate processing time (45 seconds)
-        await asyncio.sleep(10)
-        output = await process_node(node_id, params, previous_outputs)
-        processes[process_id].status = "completed"
-        processes[process_id].output = output
-        logger.info(f"[END] Node {node_id} (Process {process_id}) completed at {datetime.now().isoformat()}")
-        logger.info(f"📤 Output: {output}")
-    except asyncio.CancelledError:
-        logger.info(f"🛑 Node {node_id} (Process {process_id}) was cancelled")
-        processes[process_id].status = "stopped"
-        processes[process_id].error = "Process stopped by user"
-        raise  # Re-raise the cancellation
-    except Exception as e:
-        logger.error(f"❌ Error processing node {node_id}: {str(e)}")
-        processes[process_id].status = "failed"
-        processes[process_id].error = str(e)
-        # Create error output with fail_message
-        error_output = {
-            "status": "failed",
-            "run_parameters": params.dict(),
-            "execution_logs": [
-                f"Starting processing at {datetime.now().isoformat()}",
-                f"Processing with environment: {params.runEnv}",
-                f"Processing failed at {datetime.now().isoformat()}"
-            ],
-            "calculation_results": {
-                "processed_at": datetime.now().isoformat(),
-                "environment": params.runEnv,
-                "error_occurred": True
-            },
-            'histogram_data': [],
-            'count': '0',
-            'fail_message': str(e)
+    def __init__(self, capacity: int = SKETCH_TOP_K_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+
+    def _floor(self) -> int:
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def update(self, values: Iterable[str]):
+        iterator = iter(values)
+        while True:
+            batch = Counter(islice(iterator, self.BATCH_SIZE))
+            if not batch:
+                return
+            self._merge_counts(batch, 0)
+
+    def merge(self, other: "SpaceSaving"):
+        self._merge_counts(other.counts, other._floor())
+
+    def _merge_counts(self, counts: Dict[str, int], other_floor: int):
+        floor = self._floor()
+        merged = {value: count + counts.get(value, other_floor) for value, count in self.counts.items()}
+        for value, count in counts.items():
+            if value not in merged:
+                merged[value] = count + floor
+        kept = sorted(merged.items(), key=lambda item: (-item[1], item[0]))[:self.capacity]
+        self.counts = dict(kept)
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        return list(self.counts.items())[:k]
+
+class NumericColumnSketch:
+    """Bounded-memory profile of a numeric column, mergeable across row chunks.
+
+    Count, min, max, mean and std_dev are exact (RunningMoments).
+    unique_values comes from a HyperLogLog, and median, percentiles and bin
+    counts from a KLL sketch, with the error bounds documented on those
+    classes.
+    """
+
+    def __init__(self):
+        self.moments = RunningMoments()
+        self.distinct = HyperLogLog()
+        self.quantiles = KLLSketch()
+
+    def update(self, values: Sequence[float]):
+        if len(values) == 0:
+            return
+        self.moments.update(values)
+        self.distinct.update(values)
+        self.quantiles.update(values)
+
+    def merge(self, other: "NumericColumnSketch"):
+        if other.moments.count:
+            self.moments.merge(other.moments)
+            self.distinct.merge(other.distinct)
+            self.quantiles.merge(other.quantiles)
+
+    def profile(self, column_name: str, bins: int = 10) -> Dict:
+        """Histogram entry in the profile_numeric_column format, marked approximate."""
+        count = self.moments.count
+        if count == 0:
+            return numeric_profile_entry(column_name, self.moments, 0, None, [], [])
+        bins = max(1, bins)
+        bin_edges = equal_width_edges(self.moments.minimum, self.moments.maximum, bins)
+        if self.moments.minimum == self.moments.maximum:
+            bin_counts = [count] + [0] * (bins - 1)
+        else:
+            positions = [0] + self.quantiles.ranks(bin_edges[1:-1]) + [count]
+            bin_counts = [positions[i + 1] - positions[i] for i in range(bins)]
+        median, p5, p25, p75, p95, p99 = self.quantiles.quantiles([0.5, 0.05, 0.25, 0.75, 0.95, 0.99])
+        entry = numeric_profile_entry(column_name, self.moments, min(self.distinct.estimate(), count),
+                                      median, bin_edges, bin_counts)
+        entry['percentiles'] = {'p5': p5, 'p25': p25, 'p75': p75, 'p95': p95, 'p99': p99}
+        entry['approximate'] = True
+        entry['error_bounds'] = {
+            'unique_values_relative_std_error': 1.04 / math.sqrt(len(self.distinct.registers)),
+            # ~1.65% of total_values at k=200, scaling as 1/k
+            'quantile_rank_error': 3.3 / self.quantiles.k
         }
-        processes[process_id].output = error_output
+        return entry
 
-async def process_node(node_id: str, params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
-    """Main node processing function that routes to specific node handlers.
-    
-    Currently all nodes use the enhanced generic node processor for consistent
-    data generation and analysis.
+class TextColumnSketch:
+    """Bounded-memory profile of a text column, mergeable across row chunks.
+
+    Count and length statistics are exact; unique_values comes from a
+    HyperLogLog and the top values from a Space-Saving summary, whose counts
+    may over-estimate by up to total_values / SKETCH_TOP_K_CAPACITY.
     """
-    logger.info(f"🎯 Processing node: {node_id}")
-    
-    # Test case: Simulate failure for specific node or parameter
-    if params.runEnv == "TEST_FAILURE" or node_id == "test_failure_node":
-        raise Exception("Test failure: This is a simulated error for testing the failed node functionality. The node encountered a critical error during data processing.")
-    
-    # Always return a large random table for all nodes using enhanced processor
-    return await process_generic_node(params)
+
+    def __init__(self):
+        self.count = 0
+        self.min_length = None
+        self.max_length = None
+        self.total_length = 0
+        self.distinct = HyperLogLog()
+        self.heavy_hitters = SpaceSaving()
+
+    def update(self, values: Sequence[str]):
+        if len(values) == 0:
+            return
+        if isinstance(values, TextColumn):
+            values = list(values)  # decode once for the three passes below
+        lengths = [len(str(value)) for value in values]
+        self.count += len(lengths)
+        self.total_length += sum(lengths)
+        self.min_length = min(lengths) if self.min_length is None else min(self.min_length, min(lengths))
+        self.max_length = max(lengths) if self.max_length is None else max(self.max_length, max(lengths))
+        self.distinct.update(values)
+        self.heavy_hitters.update(values)
+
+    def merge(self, other: "TextColumnSketch"):
+        if other.count:
+            self.count += other.count
+            self.total_length += other.total_length
+            self.min_length = other.min_length if self.min_length is None else min(self.min_length, other.min_length)
+            self.max_length = other.max_length if self.max_length is None else max(self.max_length, other.max_length)
+            self.distinct.merge(other.distinct)
+            self.heavy_hitters.merge(other.heavy_hitters)
+
+    def profile(self, column_name: str, top_k: int = 10) -> Dict:
+        """Histogram entry in the profile_text_column format, marked approximate."""
+        entry = text_profile_entry(column_name, self.count, min(self.distinct.estimate(), self.count),
+                                   self.heavy_hitters.top(top_k), self.min_length, self.max_length,
+                                   self.total_length)
+        if self.count:
+            entry['approximate'] = True
+            entry['error_bounds'] = {
+                'unique_values_relative_std_error': 1.04 / math.sqrt(len(self.distinct.registers)),
+                'top_values_max_overcount': self.count // self.heavy_hitters.capacity
+            }
+        return entry
+
+# Mergeable per-column aggregate for each (column kind, profileMode)
+COLUMN_AGGREGATES = {
+    ("numeric", "exact"): NumericColumnStats,
+    ("text", "exact"): TextColumnStats,
+    ("numeric", "sketch"): NumericColumnSketch,
+    ("text", "sketch"): TextColumnSketch,
+}
+
+def profile_table_chunk(columns: List[Any], kinds: List[str], mode: str) -> List[Any]:
+    """Partial aggregates of one row chunk, one per column.
+
+    Runs in a profiling pool process for tall tables, so arguments and
+    result must stay picklable.
+    """
+    partials = []
+    for column, kind in zip(columns, kinds):
+        partial = COLUMN_AGGREGATES[(kind, mode)]()
+        partial.update(column)
+        partials.append(partial)
+    return partials
+
+profile_pool: Optional[ProcessPoolExecutor] = None
+
+def watch_parent_process(parent_pid: int):
+    """Profiling pool initializer: exit as soon as the owning node worker is gone.
+
+    /stop terminates node workers outright, so their pool processes cannot
+    rely on being shut down cleanly.
+    """
+    def watch():
+        while os.getppid() == parent_pid:
+            time.sleep(1)
+        os._exit(0)
+    threading.Thread(target=watch, daemon=True).start()
+
+def get_profile_pool() -> ProcessPoolExecutor:
+    """Profiling pool of the current node worker, started on first use."""
+    global profile_pool
+    if profile_pool is None:
+        profile_pool = ProcessPoolExecutor(
+            max_workers=PROFILE_WORKER_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=watch_parent_process,
+            initargs=(os.getpid(),)
+        )
+    return profile_pool
+
+def shutdown_profile_pool():
+    global profile_pool
+    if profile_pool is not None:
+        profile_pool.shutdown(wait=True, cancel_futures=True)
+        profile_pool = None
+
+def aggregate_table(table: NodeTable, kinds: List[str], mode: str = "exact",
+                    on_chunk: Optional[Callable[[int, int], None]] = None) -> List[Any]:
+    """Merged per-column aggregates of a table, computed over row chunks.
+
+    The table is split into PROFILE_CHUNK_ROWS-row chunks. Tables of at
+    least PROFILE_PARALLEL_MIN_ROWS rows have their chunks profiled
+    concurrently in the profiling pool; smaller ones are profiled in-process.
+    Partials are merged in chunk order either way, so the result does not
+    depend on how the work was spread. `on_chunk(done, total)` is called as
+    chunks are merged.
+    """
+    num_rows = table.num_rows
+    bounds = [(start, min(start + PROFILE_CHUNK_ROWS, num_rows)) for start in range(0, num_rows, PROFILE_CHUNK_ROWS)]
+    if len(bounds) <= 1:
+        chunk_partials = iter([profile_table_chunk(table.columns, kinds, mode)])
+        bounds = bounds or [(0, 0)]
+    elif PROFILE_WORKER_PROCESSES > 1 and num_rows >= PROFILE_PARALLEL_MIN_ROWS:
+        pool = get_profile_pool()
+        futures = [pool.submit(profile_table_chunk, table.slice_columns(start, stop), kinds, mode)
+                   for start, stop in bounds]
+        chunk_partials = (future.result() for future in futures)
+    else:
+        chunk_partials = (profile_table_chunk(table.slice_columns(start, stop), kinds, mode)
+                          for start, stop in bounds)
+
+    merged = None
+    for done, partials in enumerate(chunk_partials, start=1):
+        if merged is None:
+            merged = partials
+        else:
+            for aggregate, partial in zip(merged, partials):
+                aggregate.merge(partial)
+        if on_chunk is not None:
+            on_chunk(done, len(bounds))
+    return merged
 
 def process_config_comp_node(params: RunParameters) -> Dict:
     """Process the combined config node that handles both SRC and TGT configurations."""
@@ -255,26 +3211,13 @@ def process_config_comp_node(params: RunParameters) -> Dict:
     ]
     
     # Generate histogram data for config parameters
-    histogram_data = []
-    for item in config_data:
-        histogram_data.append({
-            'column_name': item['parameter'],
-            'data_type': 'text',
-            'total_values': 1,
-            'unique_values': 1,
-            'top_values': [{'value': str(item['value']), 'count': 1}],
-            'summary': {
-                'min_length': len(str(item['value'])),
-                'max_length': len(str(item['value'])),
-                'avg_length': len(str(item['value']))
-            }
-        })
+    histogram_data = [profile_text_column(item['parameter'], [str(item['value'])]) for item in config_data]
     
     return {
         "status": "success" if is_valid else "failed",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting combined config validation at {datetime.now().isoformat()}",
+            "Starting combined config validation",
             f"Checking file path: {params.inputConfigFilePath}",
             f"Validating against pattern: {params.inputConfigFilePattern}",
             f"Environment: {params.runEnv}",
@@ -299,7 +3242,7 @@ def process_config_comp_node(params: RunParameters) -> Dict:
         'fail_message': None if is_valid else "Configuration validation failed"
     }
 
-def process_file_search_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, side: str = "src") -> Dict:
+def process_file_search_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, side: str = "src", rng=random) -> Dict:
     """Process the file searching component for either SRC or TGT side."""
     has_valid_path = '/' in params.rootFileDir or '\\' in params.rootFileDir
     
@@ -312,8 +3255,8 @@ def process_file_search_node(params: RunParameters, previous_outputs: Optional[D
     
     # Generate sample file data for histogram analysis
     files_found = [f"example_{side}_1.dat", f"example_{side}_2.dat", f"example_{side}_3.dat"]
-    file_sizes = [random.randint(1000, 100000) for _ in files_found]
-    file_types = [f".{random.choice(['dat', 'csv', 'txt', 'json'])}" for _ in files_found]
+    file_sizes = [rng.randint(1000, 100000) for _ in files_found]
+    file_types = [f".{rng.choice(['dat', 'csv', 'txt', 'json'])}" for _ in files_found]
     
     file_data = []
     for i, file_name in enumerate(files_found):
@@ -325,52 +3268,16 @@ def process_file_search_node(params: RunParameters, previous_outputs: Optional[D
         })
     
     # Generate histogram data for file analysis
-    histogram_data = []
-    
-    # File size histogram
-    if file_sizes:
-        histogram_data.append({
-            'column_name': 'file_size',
-            'data_type': 'numeric',
-            'total_values': len(file_sizes),
-            'unique_values': len(set(file_sizes)),
-            'summary': {
-                'min': min(file_sizes),
-                'max': max(file_sizes),
-                'mean': sum(file_sizes) / len(file_sizes),
-                'median': sorted(file_sizes)[len(file_sizes)//2],
-                'std_dev': (sum((x - sum(file_sizes)/len(file_sizes))**2 for x in file_sizes) / len(file_sizes))**0.5
-            },
-            'distribution': {
-                'bins': 5,
-                'bin_edges': [min(file_sizes) + i * (max(file_sizes) - min(file_sizes)) / 5 for i in range(6)],
-                'bin_counts': [len([x for x in file_sizes if min(file_sizes) + i * (max(file_sizes) - min(file_sizes)) / 5 <= x < min(file_sizes) + (i+1) * (max(file_sizes) - min(file_sizes)) / 5]) for i in range(5)]
-            }
-        })
-    
-    # File type histogram
-    type_counts = {}
-    for file_type in file_types:
-        type_counts[file_type] = type_counts.get(file_type, 0) + 1
-    
-    histogram_data.append({
-        'column_name': 'file_type',
-        'data_type': 'text',
-        'total_values': len(file_types),
-        'unique_values': len(type_counts),
-        'top_values': [{'value': file_type, 'count': count} for file_type, count in type_counts.items()],
-        'summary': {
-            'min_length': min(len(file_type) for file_type in file_types),
-            'max_length': max(len(file_type) for file_type in file_types),
-            'avg_length': sum(len(file_type) for file_type in file_types) / len(file_types)
-        }
-    })
+    histogram_data = [
+        profile_numeric_column('file_size', file_sizes, bins=5),
+        profile_text_column('file_type', file_types)
+    ]
     
     return {
         "status": "success" if has_valid_path else "failed",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting {side.upper()} file search at {datetime.now().isoformat()}",
+            f"Starting {side.upper()} file search",
             f"Checking {side.upper()} directory: {side_path}",
             f"Environment: {params.runEnv}",
             f"File search completed for {side.upper()}",
@@ -389,7 +3296,7 @@ def process_file_search_node(params: RunParameters, previous_outputs: Optional[D
         'fail_message': None if has_valid_path else f"File search failed for {side.upper()} directory: {side_path}"
     }
 
-def process_pre_harmonisation_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]], flow_type: str) -> Dict:
+def process_pre_harmonisation_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]], flow_type: str, rng=random) -> Dict:
     """Process pre-harmonisation node for either SRC or TGT flow.
     
     This node performs initial data standardization before the main harmonisation:
@@ -397,7 +3304,7 @@ def process_pre_harmonisation_node(params: RunParameters, previous_outputs: Opti
     2. Initial format standardization
     3. Preliminary data quality checks
     """
-    logger.info(f"Processing pre-harmonisation for {flow_type.upper()} flow")
+    logger.info("Processing pre-harmonisation for %s flow", flow_type.upper())
     
     try:
         # Get previous node output
@@ -409,65 +3316,27 @@ def process_pre_harmonisation_node(params: RunParameters, previous_outputs: Opti
         
         # Generate sample quality metrics data
         quality_metrics = {
-            "missing_values": random.randint(0, 50),
-            "invalid_formats": random.randint(0, 20),
-            "duplicate_records": random.randint(0, 30),
-            "data_consistency_score": random.uniform(0.8, 1.0),
+            "missing_values": rng.randint(0, 50),
+            "invalid_formats": rng.randint(0, 20),
+            "duplicate_records": rng.randint(0, 30),
+            "data_consistency_score": rng.uniform(0.8, 1.0),
             "format_standardization_applied": True
         }
         
         # Generate histogram data for quality metrics
-        histogram_data = []
-        
-        # Missing values distribution
-        histogram_data.append({
-            'column_name': 'missing_values',
-            'data_type': 'numeric',
-            'total_values': 1,
-            'unique_values': 1,
-            'summary': {
-                'min': quality_metrics["missing_values"],
-                'max': quality_metrics["missing_values"],
-                'mean': quality_metrics["missing_values"],
-                'median': quality_metrics["missing_values"],
-                'std_dev': 0
-            },
-            'distribution': {
-                'bins': 1,
-                'bin_edges': [0, quality_metrics["missing_values"]],
-                'bin_counts': [1]
-            }
-        })
-        
-        # Data consistency score
-        histogram_data.append({
-            'column_name': 'data_consistency_score',
-            'data_type': 'numeric',
-            'total_values': 1,
-            'unique_values': 1,
-            'summary': {
-                'min': quality_metrics["data_consistency_score"],
-                'max': quality_metrics["data_consistency_score"],
-                'mean': quality_metrics["data_consistency_score"],
-                'median': quality_metrics["data_consistency_score"],
-                'std_dev': 0
-            },
-            'distribution': {
-                'bins': 1,
-                'bin_edges': [0, 1],
-                'bin_counts': [1]
-            }
-        })
+        histogram_data = [
+            profile_numeric_column('missing_values', [quality_metrics["missing_values"]], bins=1),
+            profile_numeric_column('data_consistency_score', [quality_metrics["data_consistency_score"]], bins=1)
+        ]
         
         # Simulate pre-harmonisation processing
         output = {
             "standardized_data": input_data,
             "data_quality_metrics": quality_metrics,
-            "flow_type": flow_type,
-            "timestamp": datetime.now().isoformat()
+            "flow_type": flow_type
         }
         
-        logger.info(f"✅ Pre-harmonisation completed for {flow_type.upper()} flow")
+        logger.info("✅ Pre-harmonisation completed for %s flow", flow_type.upper())
         return {
             **output,
             'histogram_data': histogram_data,
@@ -476,73 +3345,35 @@ def process_pre_harmonisation_node(params: RunParameters, previous_outputs: Opti
         }
         
     except Exception as e:
-        logger.error(f"❌ Error in pre-harmonisation node: {str(e)}")
+        logger.error("❌ Error in pre-harmonisation node: %s", e)
         raise
 
-def process_harmonisation_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+def process_harmonisation_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, rng=random) -> Dict:
     # Generate sample harmonisation metrics
     harmonisation_metrics = {
-        "records_processed": random.randint(500, 2000),
-        "records_harmonized": random.randint(400, 1800),
-        "harmonisation_success_rate": random.uniform(0.85, 0.98),
-        "processing_time_seconds": random.uniform(10.0, 60.0),
-        "data_quality_improvement": random.uniform(0.1, 0.3)
+        "records_processed": rng.randint(500, 2000),
+        "records_harmonized": rng.randint(400, 1800),
+        "harmonisation_success_rate": rng.uniform(0.85, 0.98),
+        "processing_time_seconds": rng.uniform(10.0, 60.0),
+        "data_quality_improvement": rng.uniform(0.1, 0.3)
     }
     
     # Generate histogram data for harmonisation metrics
-    histogram_data = []
-    
-    # Success rate distribution
-    histogram_data.append({
-        'column_name': 'harmonisation_success_rate',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': harmonisation_metrics["harmonisation_success_rate"],
-            'max': harmonisation_metrics["harmonisation_success_rate"],
-            'mean': harmonisation_metrics["harmonisation_success_rate"],
-            'median': harmonisation_metrics["harmonisation_success_rate"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 1],
-            'bin_counts': [1]
-        }
-    })
-    
-    # Processing time distribution
-    histogram_data.append({
-        'column_name': 'processing_time_seconds',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': harmonisation_metrics["processing_time_seconds"],
-            'max': harmonisation_metrics["processing_time_seconds"],
-            'mean': harmonisation_metrics["processing_time_seconds"],
-            'median': harmonisation_metrics["processing_time_seconds"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 100],
-            'bin_counts': [1]
-        }
-    })
+    histogram_data = [
+        profile_numeric_column('harmonisation_success_rate', [harmonisation_metrics["harmonisation_success_rate"]], bins=1),
+        profile_numeric_column('processing_time_seconds', [harmonisation_metrics["processing_time_seconds"]], bins=1)
+    ]
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting harmonisation at {datetime.now().isoformat()}",
+            "Starting harmonisation",
             f"Processing with environment: {params.runEnv}",
             "Harmonisation completed"
         ],
         "calculation_results": {
             "harmonisation_info": {
-                "processed_at": datetime.now().isoformat(),
                 "environment": params.runEnv,
                 "metrics": harmonisation_metrics
             }
@@ -552,70 +3383,32 @@ def process_harmonisation_node(params: RunParameters, previous_outputs: Optional
         'fail_message': None
     }
 
-def process_enrichment_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+def process_enrichment_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, rng=random) -> Dict:
     # Generate sample enrichment metrics
     enrichment_metrics = {
-        "records_enriched": random.randint(300, 1500),
-        "enrichment_sources_used": random.randint(2, 8),
-        "enrichment_success_rate": random.uniform(0.75, 0.95),
-        "new_fields_added": random.randint(5, 20),
-        "enrichment_quality_score": random.uniform(0.7, 0.95)
+        "records_enriched": rng.randint(300, 1500),
+        "enrichment_sources_used": rng.randint(2, 8),
+        "enrichment_success_rate": rng.uniform(0.75, 0.95),
+        "new_fields_added": rng.randint(5, 20),
+        "enrichment_quality_score": rng.uniform(0.7, 0.95)
     }
     
     # Generate histogram data for enrichment metrics
-    histogram_data = []
-    
-    # Enrichment success rate distribution
-    histogram_data.append({
-        'column_name': 'enrichment_success_rate',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': enrichment_metrics["enrichment_success_rate"],
-            'max': enrichment_metrics["enrichment_success_rate"],
-            'mean': enrichment_metrics["enrichment_success_rate"],
-            'median': enrichment_metrics["enrichment_success_rate"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 1],
-            'bin_counts': [1]
-        }
-    })
-    
-    # New fields added distribution
-    histogram_data.append({
-        'column_name': 'new_fields_added',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': enrichment_metrics["new_fields_added"],
-            'max': enrichment_metrics["new_fields_added"],
-            'mean': enrichment_metrics["new_fields_added"],
-            'median': enrichment_metrics["new_fields_added"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 25],
-            'bin_counts': [1]
-        }
-    })
+    histogram_data = [
+        profile_numeric_column('enrichment_success_rate', [enrichment_metrics["enrichment_success_rate"]], bins=1),
+        profile_numeric_column('new_fields_added', [enrichment_metrics["new_fields_added"]], bins=1)
+    ]
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting enrichment at {datetime.now().isoformat()}",
+            "Starting enrichment",
             f"Processing with environment: {params.runEnv}",
             "Enrichment completed"
         ],
         "calculation_results": {
             "enrichment_info": {
-                "processed_at": datetime.now().isoformat(),
                 "environment": params.runEnv,
                 "metrics": enrichment_metrics
             }
@@ -625,70 +3418,32 @@ def process_enrichment_node(params: RunParameters, previous_outputs: Optional[Di
         'fail_message': None
     }
 
-def process_transform_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+def process_transform_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, rng=random) -> Dict:
     # Generate sample transformation metrics
     transform_metrics = {
-        "records_transformed": random.randint(400, 1800),
-        "transformation_rules_applied": random.randint(10, 50),
-        "transformation_success_rate": random.uniform(0.9, 0.99),
-        "columns_transformed": random.randint(15, 80),
-        "transformation_complexity_score": random.uniform(0.3, 0.8)
+        "records_transformed": rng.randint(400, 1800),
+        "transformation_rules_applied": rng.randint(10, 50),
+        "transformation_success_rate": rng.uniform(0.9, 0.99),
+        "columns_transformed": rng.randint(15, 80),
+        "transformation_complexity_score": rng.uniform(0.3, 0.8)
     }
     
     # Generate histogram data for transformation metrics
-    histogram_data = []
-    
-    # Transformation success rate distribution
-    histogram_data.append({
-        'column_name': 'transformation_success_rate',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': transform_metrics["transformation_success_rate"],
-            'max': transform_metrics["transformation_success_rate"],
-            'mean': transform_metrics["transformation_success_rate"],
-            'median': transform_metrics["transformation_success_rate"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 1],
-            'bin_counts': [1]
-        }
-    })
-    
-    # Columns transformed distribution
-    histogram_data.append({
-        'column_name': 'columns_transformed',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': transform_metrics["columns_transformed"],
-            'max': transform_metrics["columns_transformed"],
-            'mean': transform_metrics["columns_transformed"],
-            'median': transform_metrics["columns_transformed"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 100],
-            'bin_counts': [1]
-        }
-    })
+    histogram_data = [
+        profile_numeric_column('transformation_success_rate', [transform_metrics["transformation_success_rate"]], bins=1),
+        profile_numeric_column('columns_transformed', [transform_metrics["columns_transformed"]], bins=1)
+    ]
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting data transformation at {datetime.now().isoformat()}",
+            "Starting data transformation",
             f"Processing with environment: {params.runEnv}",
             "Transformation completed"
         ],
         "calculation_results": {
             "transform_info": {
-                "processed_at": datetime.now().isoformat(),
                 "environment": params.runEnv,
                 "metrics": transform_metrics
             }
@@ -698,71 +3453,33 @@ def process_transform_node(params: RunParameters, previous_outputs: Optional[Dic
         'fail_message': None
     }
 
-def process_combine_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+def process_combine_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, rng=random) -> Dict:
     # Generate sample combination metrics
     combine_metrics = {
-        "total_records_combined": random.randint(800, 3000),
-        "src_records_contributed": random.randint(300, 1500),
-        "tgt_records_contributed": random.randint(300, 1500),
-        "combination_success_rate": random.uniform(0.85, 0.98),
-        "duplicate_records_merged": random.randint(50, 200),
-        "final_record_count": random.randint(700, 2800)
+        "total_records_combined": rng.randint(800, 3000),
+        "src_records_contributed": rng.randint(300, 1500),
+        "tgt_records_contributed": rng.randint(300, 1500),
+        "combination_success_rate": rng.uniform(0.85, 0.98),
+        "duplicate_records_merged": rng.randint(50, 200),
+        "final_record_count": rng.randint(700, 2800)
     }
     
     # Generate histogram data for combination metrics
-    histogram_data = []
-    
-    # Combination success rate distribution
-    histogram_data.append({
-        'column_name': 'combination_success_rate',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': combine_metrics["combination_success_rate"],
-            'max': combine_metrics["combination_success_rate"],
-            'mean': combine_metrics["combination_success_rate"],
-            'median': combine_metrics["combination_success_rate"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 1],
-            'bin_counts': [1]
-        }
-    })
-    
-    # Records contribution distribution
-    histogram_data.append({
-        'column_name': 'records_contribution',
-        'data_type': 'numeric',
-        'total_values': 2,
-        'unique_values': 2,
-        'summary': {
-            'min': min(combine_metrics["src_records_contributed"], combine_metrics["tgt_records_contributed"]),
-            'max': max(combine_metrics["src_records_contributed"], combine_metrics["tgt_records_contributed"]),
-            'mean': (combine_metrics["src_records_contributed"] + combine_metrics["tgt_records_contributed"]) / 2,
-            'median': (combine_metrics["src_records_contributed"] + combine_metrics["tgt_records_contributed"]) / 2,
-            'std_dev': abs(combine_metrics["src_records_contributed"] - combine_metrics["tgt_records_contributed"]) / 2
-        },
-        'distribution': {
-            'bins': 2,
-            'bin_edges': [0, combine_metrics["src_records_contributed"], combine_metrics["tgt_records_contributed"]],
-            'bin_counts': [1, 1]
-        }
-    })
+    histogram_data = [
+        profile_numeric_column('combination_success_rate', [combine_metrics["combination_success_rate"]], bins=1),
+        profile_numeric_column('records_contribution', [combine_metrics["src_records_contributed"], combine_metrics["tgt_records_contributed"]], bins=2)
+    ]
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting data combination at {datetime.now().isoformat()}",
+            "Starting data combination",
             f"Processing with environment: {params.runEnv}",
             "Combination completed"
         ],
         "calculation_results": {
             "combine_info": {
-                "processed_at": datetime.now().isoformat(),
                 "environment": params.runEnv,
                 "metrics": combine_metrics
             }
@@ -772,71 +3489,33 @@ def process_combine_node(params: RunParameters, previous_outputs: Optional[Dict[
         'fail_message': None
     }
 
-def process_rules_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+def process_rules_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, rng=random) -> Dict:
     # Generate sample rules application metrics
     rules_metrics = {
-        "rules_applied": random.randint(20, 100),
-        "records_processed": random.randint(600, 2500),
-        "rules_success_rate": random.uniform(0.92, 0.99),
-        "rules_violations_found": random.randint(10, 100),
-        "rules_complexity_score": random.uniform(0.4, 0.9),
-        "processing_time_seconds": random.uniform(15.0, 75.0)
+        "rules_applied": rng.randint(20, 100),
+        "records_processed": rng.randint(600, 2500),
+        "rules_success_rate": rng.uniform(0.92, 0.99),
+        "rules_violations_found": rng.randint(10, 100),
+        "rules_complexity_score": rng.uniform(0.4, 0.9),
+        "processing_time_seconds": rng.uniform(15.0, 75.0)
     }
     
     # Generate histogram data for rules metrics
-    histogram_data = []
-    
-    # Rules success rate distribution
-    histogram_data.append({
-        'column_name': 'rules_success_rate',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': rules_metrics["rules_success_rate"],
-            'max': rules_metrics["rules_success_rate"],
-            'mean': rules_metrics["rules_success_rate"],
-            'median': rules_metrics["rules_success_rate"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 1],
-            'bin_counts': [1]
-        }
-    })
-    
-    # Rules violations distribution
-    histogram_data.append({
-        'column_name': 'rules_violations_found',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': rules_metrics["rules_violations_found"],
-            'max': rules_metrics["rules_violations_found"],
-            'mean': rules_metrics["rules_violations_found"],
-            'median': rules_metrics["rules_violations_found"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 150],
-            'bin_counts': [1]
-        }
-    })
+    histogram_data = [
+        profile_numeric_column('rules_success_rate', [rules_metrics["rules_success_rate"]], bins=1),
+        profile_numeric_column('rules_violations_found', [rules_metrics["rules_violations_found"]], bins=1)
+    ]
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting rules application at {datetime.now().isoformat()}",
+            "Starting rules application",
             f"Processing with environment: {params.runEnv}",
             "Rules applied"
         ],
         "calculation_results": {
             "rules_info": {
-                "processed_at": datetime.now().isoformat(),
                 "environment": params.runEnv,
                 "metrics": rules_metrics
             }
@@ -846,72 +3525,33 @@ def process_rules_node(params: RunParameters, previous_outputs: Optional[Dict[st
         'fail_message': None
     }
 
-def process_output_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+def process_output_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, rng=random) -> Dict:
     # Generate sample output generation metrics
     output_metrics = {
-        "final_records_generated": random.randint(500, 2000),
-        "output_files_created": random.randint(1, 5),
-        "output_generation_success_rate": random.uniform(0.95, 1.0),
-        "output_file_sizes_mb": [random.uniform(1.0, 50.0) for _ in range(random.randint(1, 5))],
-        "output_quality_score": random.uniform(0.9, 1.0),
-        "processing_time_seconds": random.uniform(5.0, 30.0)
+        "final_records_generated": rng.randint(500, 2000),
+        "output_files_created": rng.randint(1, 5),
+        "output_generation_success_rate": rng.uniform(0.95, 1.0),
+        "output_file_sizes_mb": [rng.uniform(1.0, 50.0) for _ in range(rng.randint(1, 5))],
+        "output_quality_score": rng.uniform(0.9, 1.0),
+        "processing_time_seconds": rng.uniform(5.0, 30.0)
     }
     
     # Generate histogram data for output metrics
-    histogram_data = []
-    
-    # Output generation success rate distribution
-    histogram_data.append({
-        'column_name': 'output_generation_success_rate',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': output_metrics["output_generation_success_rate"],
-            'max': output_metrics["output_generation_success_rate"],
-            'mean': output_metrics["output_generation_success_rate"],
-            'median': output_metrics["output_generation_success_rate"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 1],
-            'bin_counts': [1]
-        }
-    })
-    
-    # Output file sizes distribution
-    if output_metrics["output_file_sizes_mb"]:
-        histogram_data.append({
-            'column_name': 'output_file_sizes_mb',
-            'data_type': 'numeric',
-            'total_values': len(output_metrics["output_file_sizes_mb"]),
-            'unique_values': len(set(output_metrics["output_file_sizes_mb"])),
-            'summary': {
-                'min': min(output_metrics["output_file_sizes_mb"]),
-                'max': max(output_metrics["output_file_sizes_mb"]),
-                'mean': sum(output_metrics["output_file_sizes_mb"]) / len(output_metrics["output_file_sizes_mb"]),
-                'median': sorted(output_metrics["output_file_sizes_mb"])[len(output_metrics["output_file_sizes_mb"])//2],
-                'std_dev': (sum((x - sum(output_metrics["output_file_sizes_mb"])/len(output_metrics["output_file_sizes_mb"]))**2 for x in output_metrics["output_file_sizes_mb"]) / len(output_metrics["output_file_sizes_mb"]))**0.5
-            },
-            'distribution': {
-                'bins': min(5, len(output_metrics["output_file_sizes_mb"])),
-                'bin_edges': [min(output_metrics["output_file_sizes_mb"]) + i * (max(output_metrics["output_file_sizes_mb"]) - min(output_metrics["output_file_sizes_mb"])) / min(5, len(output_metrics["output_file_sizes_mb"])) for i in range(min(5, len(output_metrics["output_file_sizes_mb"])) + 1)],
-                'bin_counts': [len([x for x in output_metrics["output_file_sizes_mb"] if min(output_metrics["output_file_sizes_mb"]) + i * (max(output_metrics["output_file_sizes_mb"]) - min(output_metrics["output_file_sizes_mb"])) / min(5, len(output_metrics["output_file_sizes_mb"])) <= x < min(output_metrics["output_file_sizes_mb"]) + (i+1) * (max(output_metrics["output_file_sizes_mb"]) - min(output_metrics["output_file_sizes_mb"])) / min(5, len(output_metrics["output_file_sizes_mb"]))]) for i in range(min(5, len(output_metrics["output_file_sizes_mb"])))]
-            }
-        })
+    histogram_data = [
+        profile_numeric_column('output_generation_success_rate', [output_metrics["output_generation_success_rate"]], bins=1),
+        profile_numeric_column('output_file_sizes_mb', output_metrics["output_file_sizes_mb"], bins=min(5, len(output_metrics["output_file_sizes_mb"])))
+    ]
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting output generation at {datetime.now().isoformat()}",
+            "Starting output generation",
             f"Processing with environment: {params.runEnv}",
             "Output generated"
         ],
         "calculation_results": {
             "output_info": {
-                "processed_at": datetime.now().isoformat(),
                 "environment": params.runEnv,
                 "metrics": output_metrics
             }
@@ -921,72 +3561,33 @@ def process_output_node(params: RunParameters, previous_outputs: Optional[Dict[s
         'fail_message': None
     }
 
-def process_break_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None) -> Dict:
+def process_break_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]] = None, rng=random) -> Dict:
     # Generate sample break rolling metrics
     break_metrics = {
-        "break_periods_processed": random.randint(10, 50),
-        "records_per_break_period": [random.randint(50, 500) for _ in range(random.randint(10, 50))],
-        "break_rolling_success_rate": random.uniform(0.88, 0.97),
-        "total_break_records": random.randint(500, 2500),
-        "break_period_accuracy": random.uniform(0.85, 0.95),
-        "processing_time_seconds": random.uniform(20.0, 90.0)
+        "break_periods_processed": rng.randint(10, 50),
+        "records_per_break_period": [rng.randint(50, 500) for _ in range(rng.randint(10, 50))],
+        "break_rolling_success_rate": rng.uniform(0.88, 0.97),
+        "total_break_records": rng.randint(500, 2500),
+        "break_period_accuracy": rng.uniform(0.85, 0.95),
+        "processing_time_seconds": rng.uniform(20.0, 90.0)
     }
     
     # Generate histogram data for break rolling metrics
-    histogram_data = []
-    
-    # Break rolling success rate distribution
-    histogram_data.append({
-        'column_name': 'break_rolling_success_rate',
-        'data_type': 'numeric',
-        'total_values': 1,
-        'unique_values': 1,
-        'summary': {
-            'min': break_metrics["break_rolling_success_rate"],
-            'max': break_metrics["break_rolling_success_rate"],
-            'mean': break_metrics["break_rolling_success_rate"],
-            'median': break_metrics["break_rolling_success_rate"],
-            'std_dev': 0
-        },
-        'distribution': {
-            'bins': 1,
-            'bin_edges': [0, 1],
-            'bin_counts': [1]
-        }
-    })
-    
-    # Records per break period distribution
-    if break_metrics["records_per_break_period"]:
-        histogram_data.append({
-            'column_name': 'records_per_break_period',
-            'data_type': 'numeric',
-            'total_values': len(break_metrics["records_per_break_period"]),
-            'unique_values': len(set(break_metrics["records_per_break_period"])),
-            'summary': {
-                'min': min(break_metrics["records_per_break_period"]),
-                'max': max(break_metrics["records_per_break_period"]),
-                'mean': sum(break_metrics["records_per_break_period"]) / len(break_metrics["records_per_break_period"]),
-                'median': sorted(break_metrics["records_per_break_period"])[len(break_metrics["records_per_break_period"])//2],
-                'std_dev': (sum((x - sum(break_metrics["records_per_break_period"])/len(break_metrics["records_per_break_period"]))**2 for x in break_metrics["records_per_break_period"]) / len(break_metrics["records_per_break_period"]))**0.5
-            },
-            'distribution': {
-                'bins': min(8, len(break_metrics["records_per_break_period"])),
-                'bin_edges': [min(break_metrics["records_per_break_period"]) + i * (max(break_metrics["records_per_break_period"]) - min(break_metrics["records_per_break_period"])) / min(8, len(break_metrics["records_per_break_period"])) for i in range(min(8, len(break_metrics["records_per_break_period"])) + 1)],
-                'bin_counts': [len([x for x in break_metrics["records_per_break_period"] if min(break_metrics["records_per_break_period"]) + i * (max(break_metrics["records_per_break_period"]) - min(break_metrics["records_per_break_period"])) / min(8, len(break_metrics["records_per_break_period"])) <= x < min(break_metrics["records_per_break_period"]) + (i+1) * (max(break_metrics["records_per_break_period"]) - min(break_metrics["records_per_break_period"])) / min(8, len(break_metrics["records_per_break_period"]))]) for i in range(min(8, len(break_metrics["records_per_break_period"])))]
-            }
-        })
+    histogram_data = [
+        profile_numeric_column('break_rolling_success_rate', [break_metrics["break_rolling_success_rate"]], bins=1),
+        profile_numeric_column('records_per_break_period', break_metrics["records_per_break_period"], bins=min(8, len(break_metrics["records_per_break_period"])))
+    ]
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting break rolling at {datetime.now().isoformat()}",
+            "Starting break rolling",
             f"Processing with environment: {params.runEnv}",
             "Break rolling completed"
         ],
         "calculation_results": {
             "break_info": {
-                "processed_at": datetime.now().isoformat(),
                 "environment": params.runEnv,
                 "metrics": break_metrics
             }
@@ -996,160 +3597,189 @@ def process_break_node(params: RunParameters, previous_outputs: Optional[Dict[st
         'fail_message': None
     }
 
-async def process_generic_node(params: RunParameters) -> Dict:
+TEXT_ALPHABET = (string.ascii_letters + string.digits + ' ').encode()
+# Maps a random byte to an alphabet character (the first 256 % 63 = 4
+# characters come up marginally more often)
+TEXT_ALPHABET_TABLE = bytes(TEXT_ALPHABET[value % len(TEXT_ALPHABET)] for value in range(256))
+
+def numpy_generator(rng):
+    """NumPy generator seeded from `rng`, so NumPy draws follow the same seed."""
+    return np.random.default_rng(rng.getrandbits(64))
+
+def random_int_column(num_rows: int, low: int, high: int, rng=random) -> array:
+    """num_rows uniform integers in [low, high] as an array('q')."""
+    column = array("q")
+    if np is not None:
+        column.frombytes(numpy_generator(rng).integers(low, high + 1, size=num_rows, dtype=np.int64).tobytes())
+        return column
+    # One getrandbits call for the whole column; 64 bits per value keeps the
+    # modulo bias negligible
+    raw = array("Q")
+    raw.frombytes(rng.getrandbits(64 * num_rows).to_bytes(8 * num_rows, "little"))
+    span = high - low + 1
+    column.extend(low + value % span for value in raw)
+    return column
+
+def random_text_column(num_rows: int, rng=random, long_text_share: float = 0.0,
+                       min_length: int = 5, max_length: int = 20, long_length: int = 150) -> TextColumn:
+    """num_rows random strings over TEXT_ALPHABET, built without per-cell calls.
+
+    Lengths are uniform in [min_length, max_length], except that each cell
+    is long_length characters long with probability long_text_share.
+    """
+    if np is not None:
+        generator = numpy_generator(rng)
+        lengths = generator.integers(min_length, max_length + 1, size=num_rows, dtype=np.int64)
+        if long_text_share:
+            lengths[generator.random(num_rows) < long_text_share] = long_length
+        offsets = np.zeros(num_rows + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        characters = generator.integers(0, len(TEXT_ALPHABET), size=int(offsets[-1]), dtype=np.uint8)
+        data = np.frombuffer(TEXT_ALPHABET, dtype=np.uint8)[characters].tobytes()
+        column_offsets = array("q")
+        column_offsets.frombytes(offsets.tobytes())
+        return TextColumn(data, column_offsets)
+
+    # Two random bytes per cell: one picks the length, one decides long text
+    span = max_length - min_length + 1
+    length_bytes = rng.getrandbits(8 * num_rows).to_bytes(num_rows, "little")
+    lengths = [min_length + value % span for value in length_bytes]
+    if long_text_share:
+        threshold = int(long_text_share * 256)
+        long_bytes = rng.getrandbits(8 * num_rows).to_bytes(num_rows, "little")
+        lengths = [long_length if roll < threshold else length for roll, length in zip(long_bytes, lengths)]
+    offsets = array("q", [0])
+    offsets.extend(accumulate(lengths))
+    total = offsets[-1]
+    # Random bytes become alphabet characters in one bytes.translate call
+    data = rng.getrandbits(8 * total).to_bytes(total, "little").translate(TEXT_ALPHABET_TABLE)
+    return TextColumn(data, offsets)
+
+def generate_synthetic_table(num_rows: int, num_cols: int, text_ratio: float, long_text_ratio: float,
+                             rng=random, on_column: Optional[Callable[[int, int], None]] = None):
+    """Random table of integer and text columns, generated a column at a time.
+
+    A text_ratio share of the columns hold text; of those, a long_text_ratio
+    share (rounded) also get 150-character cells, 20% of the time.
+    Numeric cells are uniform in 1..10000. Returns the NodeTable plus the
+    sets of text and long-text column indices.
+    """
+    text_col_indices = set(rng.sample(range(num_cols), k=int(num_cols * text_ratio)))
+    long_text_count = int(round(len(text_col_indices) * long_text_ratio))
+    long_text_col_indices = set(rng.sample(sorted(text_col_indices), k=long_text_count))
+
+    columns = []
+    for col in range(num_cols):
+        if on_column is not None:
+            on_column(col, num_cols)
+        if col in text_col_indices:
+            columns.append(random_text_column(num_rows, rng, 0.2 if col in long_text_col_indices else 0.0))
+        else:
+            columns.append(random_int_column(num_rows, 1, 10000, rng))
+    headers = [f"col_{i+1}" for i in range(num_cols)]
+    return NodeTable(headers, columns), text_col_indices, long_text_col_indices
+
+def process_generic_node(params: RunParameters, rng=random) -> Dict:
     """Process generic node with enhanced data generation and analysis.
     
     Generates a large dataset with mixed data types and comprehensive
     statistical analysis for the frontend AG Grid display.
     
-    Note: Generates 2,000 rows internally but only sends 1,000 rows
-    to the frontend for performance optimization. Histogram statistics
-    are calculated from the full dataset for accuracy.
+    Note: Returns all rows as a columnar NodeTable; the worker keeps it
+    server-side and only the first FRONTEND_ROWS_LIMIT rows are sent with
+    the output (see split_output_table). Histogram statistics are
+    calculated from the full dataset for accuracy.
+
+    The table shape comes from the numRows, numCols, textColumnRatio and
+    longTextColumnRatio run parameters (2,000 x 100 with 30% text columns
+    by default), so the node doubles as a load generator.
     """
     start_time = time.time()
-    logger.info(f"🔄 Starting generic node processing with enhanced data generation")
+    logger.info("🔄 Starting generic node processing with enhanced data generation")
     
-    # Generate random table data: 100 columns, 2,000 rows
-    num_cols = 100
-    num_rows = 2000
-    headers = [f"col_{i+1}" for i in range(num_cols)]
+    num_cols = params.numCols
+    num_rows = params.numRows
     
-    logger.info(f"📊 Generating table: {num_cols} columns x {num_rows} rows (will send {min(1000, num_rows)} to frontend)")
-
-    # Randomly choose 30% of columns to be text columns
-    text_col_indices = set(random.sample(range(num_cols), k=int(num_cols * 0.3)))
-    # Of the text columns, 20% of their cells will be long text (150 chars)
-    long_text_col_indices = set(random.sample(list(text_col_indices), k=max(1, int(len(text_col_indices) * 0.3))))
-
-    def random_text(length):
-        """Generate random text of specified length."""
-        return ''.join(random.choices(string.ascii_letters + string.digits + ' ', k=length))
-
-    table = []
-    for row_idx in range(num_rows):
-        # Check for cancellation every 100 rows
-        if row_idx % 100 == 0:
-            await asyncio.sleep(0)  # Yield control to event loop for cancellation
-            logger.info(f"📊 Generated {row_idx}/{num_rows} rows...")
-        
-        row = []
-        for col in range(num_cols):
-            if col in text_col_indices:
-                # 20% chance for long text in long_text_col_indices
-                if col in long_text_col_indices and random.random() < 0.2:
-                    row.append(random_text(150))
-                else:
-                    row.append(random_text(random.randint(5, 20)))
-            else:
-                row.append(random.randint(1, 10000))
-        table.append(row)
+    logger.info("📊 Generating table: %s columns x %s rows (will send %s to frontend)", num_cols, num_rows, min(FRONTEND_ROWS_LIMIT, num_rows))
+
+    def on_column(col, total):
+        if col % 10 == 0:
+            progress_logger.info("📊 Generated %s/%s columns...", col, total)
+            report_progress(0.5 * col / total, f"Generated {col}/{total} columns")
+
+    # Whole columns are generated at once straight into columnar storage
+    table, text_col_indices, long_text_col_indices = generate_synthetic_table(
+        num_rows, num_cols, params.textColumnRatio, params.longTextColumnRatio, rng=rng, on_column=on_column
+    )
+    headers = table.headers
     
     # Generate histogram data with summary statistics for each column
     # Use full dataset for accurate statistics, but limit display data
+    # (profileMode="sketch" trades exactness for bounded memory per column).
+    # Columns are aggregated in row chunks that are merged afterwards, in
+    # parallel for tall tables (see aggregate_table)
+    def on_chunk(done, total):
+        progress_logger.info("📊 Profiled row chunk %s/%s...", done, total)
+        report_progress(0.5 + 0.5 * done / total, f"Profiled row chunk {done}/{total}")
+
+    kinds = ["text" if col_idx in text_col_indices else "numeric" for col_idx in range(num_cols)]
+    aggregates = aggregate_table(table, kinds, params.profileMode, on_chunk)
     histogram_data = []
     for col_idx, header in enumerate(headers):
-        # Check for cancellation every 10 columns
-        if col_idx % 10 == 0:
-            await asyncio.sleep(0)  # Yield control to event loop for cancellation
-            logger.info(f"📊 Processing histogram for column {col_idx}/{len(headers)}...")
-        
         try:
             # Use full dataset for histogram analysis to get accurate statistics
-            column_data = [row[col_idx] for row in table]
-            
             if col_idx in text_col_indices:
                 # For text columns, provide frequency analysis
-                value_counts = {}
-                for value in column_data:
-                    value_counts[value] = value_counts.get(value, 0) + 1
-                
-                # Get top 10 most frequent values
-                top_values = sorted(value_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-                
-                histogram_data.append({
-                    'column_name': header,
-                    'data_type': 'text',
-                    'total_values': len(column_data),
-                    'unique_values': len(value_counts),
-                    'top_values': [{'value': str(val), 'count': count} for val, count in top_values],
-                    'summary': {
-                        'min_length': min(len(str(val)) for val in column_data),
-                        'max_length': max(len(str(val)) for val in column_data),
-                        'avg_length': sum(len(str(val)) for val in column_data) / len(column_data)
-                    }
-                })
+                histogram_data.append(aggregates[col_idx].profile(header, top_k=10))
             else:
                 # For numeric columns, provide statistical summary
-                numeric_data = [float(val) for val in column_data]
-                histogram_data.append({
-                    'column_name': header,
-                    'data_type': 'numeric',
-                    'total_values': len(numeric_data),
-                    'unique_values': len(set(numeric_data)),
-                    'summary': {
-                        'min': min(numeric_data),
-                        'max': max(numeric_data),
-                        'mean': sum(numeric_data) / len(numeric_data),
-                        'median': sorted(numeric_data)[len(numeric_data)//2],
-                        'std_dev': (sum((x - sum(numeric_data)/len(numeric_data))**2 for x in numeric_data) / len(numeric_data))**0.5
-                    },
-                    'distribution': {
-                        'bins': 10,
-                        'bin_edges': [min(numeric_data) + i * (max(numeric_data) - min(numeric_data)) / 10 for i in range(11)],
-                        'bin_counts': [len([x for x in numeric_data if min(numeric_data) + i * (max(numeric_data) - min(numeric_data)) / 10 <= x < min(numeric_data) + (i+1) * (max(numeric_data) - min(numeric_data)) / 10]) for i in range(10)]
-                    }
-                })
+                histogram_data.append(aggregates[col_idx].profile(header, bins=10))
         except Exception as e:
-            logger.warning(f"Error processing histogram data for column {header}: {str(e)}")
+            logger.warning("Error processing histogram data for column %s: %s", header, e)
             # Add fallback histogram data
             histogram_data.append({
                 'column_name': header,
                 'data_type': 'unknown',
-                'total_values': len(table),
+                'total_values': table.num_rows,
                 'unique_values': 0,
                 'summary': {'error': str(e)},
                 'top_values': []
             })
     
-    # Limit data sent to frontend to 1000 rows for performance
-    # This reduces network transfer and improves frontend performance
-    # while maintaining accurate histogram statistics from full dataset
-    frontend_rows_limit = 1000
-    frontend_table = table[:frontend_rows_limit] if len(table) > frontend_rows_limit else table
+    # Only the first FRONTEND_ROWS_LIMIT rows are sent with the output;
+    # the rest is served on demand by /output/{process_id}/rows
+    frontend_rows = min(FRONTEND_ROWS_LIMIT, table.num_rows)
     
     processing_time = time.time() - start_time
-    logger.info(f"✅ Generic node processing completed in {processing_time:.2f} seconds")
-    logger.info(f"📈 Generated {len(histogram_data)} histogram entries")
-    logger.info(f"📤 Sending {len(frontend_table)} rows to frontend (limited from {len(table)} total rows)")
+    logger.info("✅ Generic node processing completed in %.2f seconds", processing_time)
+    logger.info("📈 Generated %s histogram entries", len(histogram_data))
+    logger.info("📤 Sending %s rows to frontend (limited from %s total rows)", frontend_rows, table.num_rows)
     
     return {
         "status": "success",
         "run_parameters": params.dict(),
         "execution_logs": [
-            f"Starting general processing at {datetime.now().isoformat()}",
+            "Starting general processing",
             f"Processing with environment: {params.runEnv}",
             f"Generated table with {num_cols} columns and {num_rows} rows",
             f"Text columns: {len(text_col_indices)}, Numeric columns: {num_cols - len(text_col_indices)}",
             f"Long text columns: {len(long_text_col_indices)}",
-            f"Processing completed successfully in {processing_time:.2f} seconds",
-            f"Frontend data limited to {len(frontend_table)} rows for performance optimization"
+            f"Frontend data limited to {frontend_rows} rows for performance optimization"
         ],
         "calculation_results": {
             "headers": headers,
-            "table": frontend_table,
-            "processed_at": datetime.now().isoformat(),
+            "table": table,
             "environment": params.runEnv,
-            "table_size": f"{len(headers)}x{len(frontend_table)}",
-            "total_rows_generated": len(table),
-            "frontend_rows_limit": frontend_rows_limit,
-            "processing_time_seconds": processing_time
+            "table_size": f"{len(headers)}x{frontend_rows}",
+            "total_rows_generated": table.num_rows,
+            "frontend_rows_limit": FRONTEND_ROWS_LIMIT
         },
         'histogram_data': histogram_data,
-        'count': str(len(table)),  # Send original table length (10,000)
+        'count': str(table.num_rows),  # Send original table length (2,000)
         'fail_message': None  # No failure in successful execution
     }
 
-def process_enrichment_file_search_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]], flow_type: str) -> Dict:
+def process_enrichment_file_search_node(params: RunParameters, previous_outputs: Optional[Dict[str, Any]], flow_type: str, rng=random) -> Dict:
     """Process enrichment file search node for either SRC or TGT flow.
     
     This node searches for enrichment files based on the harmonized data:
@@ -1157,7 +3787,7 @@ def process_enrichment_file_search_node(params: RunParameters, previous_outputs:
     2. Validates file existence and format
     3. Prepares files for enrichment process
     """
-    logger.info(f"Processing enrichment file search for {flow_type.upper()} flow")
+    logger.info("Processing enrichment file search for %s flow", flow_type.upper())
     
     try:
         # Get previous node output (harmonisation)
@@ -1176,51 +3806,15 @@ def process_enrichment_file_search_node(params: RunParameters, previous_outputs:
             f"/path/to/{flow_type}/validation_rules.json"
         ]
         
-        file_sizes = [random.randint(5000, 100000) for _ in enrichment_files]
-        file_types = [f".{random.choice(['csv', 'json', 'xml', 'txt'])}" for _ in enrichment_files]
-        file_status = ["found" if random.random() > 0.1 else "missing" for _ in enrichment_files]
+        file_sizes = [rng.randint(5000, 100000) for _ in enrichment_files]
+        file_types = [f".{rng.choice(['csv', 'json', 'xml', 'txt'])}" for _ in enrichment_files]
+        file_status = ["found" if rng.random() > 0.1 else "missing" for _ in enrichment_files]
         
         # Generate histogram data for enrichment files
-        histogram_data = []
-        
-        # File sizes distribution
-        if file_sizes:
-            histogram_data.append({
-                'column_name': 'enrichment_file_sizes',
-                'data_type': 'numeric',
-                'total_values': len(file_sizes),
-                'unique_values': len(set(file_sizes)),
-                'summary': {
-                    'min': min(file_sizes),
-                    'max': max(file_sizes),
-                    'mean': sum(file_sizes) / len(file_sizes),
-                    'median': sorted(file_sizes)[len(file_sizes)//2],
-                    'std_dev': (sum((x - sum(file_sizes)/len(file_sizes))**2 for x in file_sizes) / len(file_sizes))**0.5
-                },
-                'distribution': {
-                    'bins': min(5, len(file_sizes)),
-                    'bin_edges': [min(file_sizes) + i * (max(file_sizes) - min(file_sizes)) / min(5, len(file_sizes)) for i in range(min(5, len(file_sizes)) + 1)],
-                    'bin_counts': [len([x for x in file_sizes if min(file_sizes) + i * (max(file_sizes) - min(file_sizes)) / min(5, len(file_sizes)) <= x < min(file_sizes) + (i+1) * (max(file_sizes) - min(file_sizes)) / min(5, len(file_sizes))]) for i in range(min(5, len(file_sizes)))]
-                }
-            })
-        
-        # File types distribution
-        type_counts = {}
-        for file_type in file_types:
-            type_counts[file_type] = type_counts.get(file_type, 0) + 1
-        
-        histogram_data.append({
-            'column_name': 'enrichment_file_types',
-            'data_type': 'text',
-            'total_values': len(file_types),
-            'unique_values': len(type_counts),
-            'top_values': [{'value': file_type, 'count': count} for file_type, count in type_counts.items()],
-            'summary': {
-                'min_length': min(len(file_type) for file_type in file_types),
-                'max_length': max(len(file_type) for file_type in file_types),
-                'avg_length': sum(len(file_type) for file_type in file_types) / len(file_types)
-            }
-        })
+        histogram_data = [
+            profile_numeric_column('enrichment_file_sizes', file_sizes, bins=min(5, len(file_sizes))),
+            profile_text_column('enrichment_file_types', file_types)
+        ]
         
         # Simulate enrichment file search processing
         output = {
@@ -1235,11 +3829,10 @@ def process_enrichment_file_search_node(params: RunParameters, previous_outputs:
                 "all_files_exist": True,
                 "valid_formats": True
             },
-            "flow_type": flow_type,
-            "timestamp": datetime.now().isoformat()
+            "flow_type": flow_type
         }
         
-        logger.info(f"✅ Enrichment file search completed for {flow_type.upper()} flow")
+        logger.info("✅ Enrichment file search completed for %s flow", flow_type.upper())
         return {
             **output,
             'histogram_data': histogram_data,
@@ -1248,13 +3841,47 @@ def process_enrichment_file_search_node(params: RunParameters, previous_outputs:
         }
         
     except Exception as e:
-        logger.error(f"❌ Error in enrichment file search node: {str(e)}")
+        logger.error("❌ Error in enrichment file search node: %s", e)
         raise
 
 def validate_config_file(file_path: str, pattern: str) -> bool:
     # Add your config file validation logic here
     return True  # Placeholder return
 
+@app.get("/cache/stats")
+async def get_cache_stats():
+    return result_cache.stats()
+
+@app.get("/processes/stats")
+async def get_process_stats():
+    return process_registry.stats()
+
+@app.get("/metrics")
+async def get_metrics():
+    """Run pipeline metrics of this API worker in Prometheus text exposition format.
+
+    Async like every handler reading run state: it must run on the event
+    loop, which mutates that state, not in the threadpool.
+    """
+    lines = node_run_duration.render() + node_runs_total.render()
+    gauges = [
+        ("run_queue_depth", "Node runs waiting for a run slot", {(): len(run_scheduler.queue)}),
+        ("active_runs", "Node runs holding a run slot", {(): run_scheduler.active}),
+        ("active_tasks", "Unfinished background tasks (node runs and pipelines)",
+         {(): sum(not task.done() for task in tasks.values())}),
+        ("processes", "Processes held by this worker, by status",
+         {(status,): count for status, count in Counter(process.status for process in processes.values()).items()}),
+        ("process_output_bytes", "Bytes of process outputs and result tables held outside the result cache", {(): process_registry.total_bytes}),
+        ("result_cache_bytes", "Bytes held by the node result cache", {(): result_cache.total_bytes}),
+        ("event_loop_lag_last_seconds", "Most recent event loop lag probe", {(): last_event_loop_lag}),
+    ]
+    for name, help_text, values in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for label_values, value in sorted(values.items()):
+            lines.append(f"{name}{metric_labels(('status',) if label_values else (), label_values)} {value}")
+    lines += event_loop_lag.render() + http_request_duration.render()
+    return Response(content="\n".join(lines) + "\n", media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/health")
 def health_check():
     logger.info("Health check endpoint called")
@@ -852,6 +852,8 @@ export default function CompletenessControl({ instanceId }) {
         }
         return {};
     });
+    // Latest process IDs, readable while a dependency chain is still running
+    const processIdsRef = useRef(processIds);
     const [isRunningAll, setIsRunningAll] = useState(false);
     const [invalidFields, setInvalidFields] = useState(new Set());
     const [validatedParams, setValidatedParams] = useState(null);
@@ -1234,7 +1236,7 @@ export default function CompletenessControl({ instanceId }) {
         console.log('🧹 Reset all nodes and cleared all data');
     }, [setNodes, nodeOutputsKey, forceUpdate, processIdsKey, uiStateKey]);
 
-    // Function to run nodes in sequence
+    // Run the whole graph as one server-side pipeline
     const runAllNodes = async () => {
         if (!areParamsApplied) {
             console.log('❌ Cannot run all nodes: Parameters have not been applied');
@@ -1250,54 +1252,37 @@ export default function CompletenessControl({ instanceId }) {
         }
 
         setIsRunningAll(true);
-        const nodeSequence = [
-            // Top flow
-            'reading_config_comp',
-            'read_src_comp',
-            'pre_harmonisation_src_comp',
-            'harmonisation_src_comp',
-            'enrichment_file_search_src_comp',
-            'enrichment_src_comp',
-            'data_transform_src_comp',
-            // Bottom flow
-            'read_tgt_comp',
-            'pre_harmonisation_tgt_comp',
-            'harmonisation_tgt_comp',
-            'enrichment_file_search_tgt_comp',
-            'enrichment_tgt_comp',
-            'data_transform_tgt_comp',
-            // Final flow
-            'combine_data_comp',
-            'apply_rules_comp',
-            'output_rules_comp',
-            'break_rolling_comp'
-        ];
+        cancelledNodesRef.current = new Set();
 
         try {
-            for (const nodeId of nodeSequence) {
-                const node = nodes.find(n => n.id === nodeId);
-                if (node?.data.onRun) {
-                    await new Promise((resolve, reject) => {
-                        let checkInterval;
-
-                        const checkStatus = () => {
-                            const currentNode = nodes.find(n => n.id === nodeId);
-                            if (currentNode?.data.status === 'completed') {
-                                clearInterval(checkInterval);
-                                resolve();
-                            } else if (currentNode?.data.status === 'failed') {
-                                clearInterval(checkInterval);
-                                reject(new Error(`Node ${nodeId} failed`));
-                            }
-                        };
-
-                        node.data.onRun(nodeId);
-                        checkInterval = setInterval(checkStatus, 1000);
-                    });
+            const params = JSON.parse(storedParams);
+            // The server runs the whole graph, starting independent branches in
+            // parallel, and streams every node's status over one connection
+            const pipeline = await ApiService.runPipeline('break_rolling_comp', params);
+            const nodeIdsByProcessId = Object.fromEntries(
+                Object.entries(pipeline.process_ids).map(([nodeId, processId]) => [processId, nodeId])
+            );
+            processIdsRef.current = { ...processIdsRef.current, ...pipeline.process_ids };
+            setProcessIds(prev => ({ ...prev, ...pipeline.process_ids }));
+
+            const outputFetches = [];
+            await ApiService.waitForPipeline(pipeline.pipeline_id, (status) => {
+                const nodeId = nodeIdsByProcessId[status.process_id];
+                if (!nodeId || cancelledNodesRef.current.has(nodeId)) return;
+                if (status.status === 'reset') {
+                    updateNodeStatus(nodeId, 'idle');
+                    return;
                 }
-            }
+                updateNodeStatus(nodeId, status.status === 'pending' ? 'queued' : status.status);
+                if (status.status === 'completed') {
+                    outputFetches.push(ApiService.getProcessOutput(status.process_id).then(output => {
+                        setNodeOutputs(prev => ({ ...prev, [nodeId]: output }));
+                    }));
+                }
+            });
+            await Promise.all(outputFetches);
         } catch (error) {
-            console.error('Error in sequential execution:', error);
+            console.error('Error in pipeline execution:', error);
         } finally {
             setIsRunningAll(false);
         }
@@ -1408,6 +1393,7 @@ export default function CompletenessControl({ instanceId }) {
 
     // Update localStorage whenever processIds changes
     useEffect(() => {
+        processIdsRef.current = processIds;
         try {
             safeLocalStorageSet(processIdsKey, JSON.stringify(processIds));
             console.log('💾 Saved process IDs to localStorage');
@@ -1529,73 +1515,79 @@ export default function CompletenessControl({ instanceId }) {
             }
             // Update status to running (this will override queued status)
             updateNodeStatus(nodeId, 'running');
+            // Upstream outputs stay on the server; send their process IDs instead,
+            // and inline only outputs the server never saw
+            const previousOutputRefs = {};
+            const inlineOutputs = {};
+            Object.entries(previousOutputs || {}).forEach(([depId, output]) => {
+                if (!output) return;
+                if (processIdsRef.current[depId]) {
+                    previousOutputRefs[depId] = processIdsRef.current[depId];
+                } else {
+                    inlineOutputs[depId] = output;
+                }
+            });
             const request = {
                 nodeId,
                 parameters: params,
-                previousOutputs,
+                previousOutputRefs,
+                previousOutputs: inlineOutputs,
                 timestamp: new Date().toISOString()
             };
-            const response = await ApiService.startCalculation(request);
+            let response;
+            try {
+                response = await ApiService.startCalculation(request);
+            } catch (error) {
+                // 404/410: the server no longer holds an upstream output (restart,
+                // TTL sweep or eviction), so send the outputs we have inline
+                if (error.status !== 404 && error.status !== 410) throw error;
+                console.log(`♻️ Upstream outputs of ${nodeId} expired on the server, sending them inline`);
+                response = await ApiService.startCalculation({
+                    ...request,
+                    previousOutputRefs: {},
+                    previousOutputs: Object.fromEntries(
+                        Object.entries(previousOutputs || {}).filter(([, output]) => output)
+                    )
+                });
+            }
             if (response.process_id) {
+                processIdsRef.current = { ...processIdsRef.current, [nodeId]: response.process_id };
                 setProcessIds(prev => ({ ...prev, [nodeId]: response.process_id }));
 
-                // Poll for completion with proper timeout and retry limits
-                const maxRetries = 30; // Maximum 30 attempts (2.5 minutes)
-                const pollInterval = 5000; // 5 seconds
-                let pollCount = 0;
-
-                while (pollCount < maxRetries) {
-                    // Check if node has been cancelled
+                // Wait for the server to push the final status over SSE
+                try {
+                    const finalStatus = await ApiService.waitForProcess(response.process_id);
                     if (cancelledNodesRef.current.has(nodeId)) {
-                        console.log(`🛑 Node ${nodeId} was cancelled, stopping polling`);
-                        break;
+                        console.log(`🛑 Node ${nodeId} was cancelled while running`);
+                        return null;
                     }
-
-                    try {
-                        pollCount++;
-                        console.log(`🔄 Polling status for node ${nodeId} (Process ID: ${response.process_id}) - Attempt ${pollCount}/${maxRetries}`);
-
-                        const status = await ApiService.getProcessStatus(response.process_id);
-
-                        if (status.status === 'completed' || status.status === 'failed' || status.status === 'stopped') {
-                            console.log(`✅ Node ${nodeId} finished with status: ${status.status}`);
-                            updateNodeStatus(nodeId, status.status);
-
-                            if (status.status === 'completed' && status.output) {
-                                setNodeOutputs(prev => {
-                                    const updated = { ...prev, [nodeId]: status.output };
-                                    return updated;
-                                });
-                                return status.output;
-                            }
-
-                            // Force a small delay to ensure UI updates
-                            if (status.status === 'stopped') {
-                                console.log(`🛑 Node ${nodeId} was stopped, ensuring UI update`);
-                                setTimeout(() => updateNodeStatus(nodeId, 'stopped'), 100);
-                            }
-
-                            break; // Exit the loop
-                        } else {
-                            console.log(`⏳ Node ${nodeId} still running... (${status.status})`);
-                            await new Promise(res => setTimeout(res, pollInterval));
+                    console.log(`✅ Node ${nodeId} finished with status: ${finalStatus.status}`);
+                    updateNodeStatus(nodeId, finalStatus.status);
+
+                    if (finalStatus.status === 'completed') {
+                        const output = await ApiService.getProcessOutput(response.process_id);
+                        if (output) {
+                            setNodeOutputs(prev => {
+                                const updated = { ...prev, [nodeId]: output };
+                                return updated;
+                            });
+                            return output;
                         }
-                    } catch (error) {
-                        console.error(`❌ Error polling node ${nodeId}:`, error);
-                        // Only set to failed if the node is not idle
-                        setNodes(nds => nds.map(node =>
-                            node.id === nodeId && node.data.status !== 'idle'
-                                ? { ...node, data: { ...node.data, status: 'failed' } }
-                                : node
-                        ));
-                        break; // Exit the loop on error
                     }
-                }
 
-                // If we reached max retries, mark as failed
-                if (pollCount >= maxRetries) {
-                    console.warn(`⚠️ Node ${nodeId} exceeded maximum polling attempts (${maxRetries})`);
-                    updateNodeStatus(nodeId, 'failed');
+                    // Force a small delay to ensure UI updates
+                    if (finalStatus.status === 'stopped') {
+                        console.log(`🛑 Node ${nodeId} was stopped, ensuring UI update`);
+                        setTimeout(() => updateNodeStatus(nodeId, 'stopped'), 100);
+                    }
+                } catch (error) {
+                    console.error(`❌ Error waiting for node ${nodeId}:`, error);
+                    // Only set to failed if the node is not idle
+                    setNodes(nds => nds.map(node =>
+                        node.id === nodeId && node.data.status !== 'idle'
+                            ? { ...node, data: { ...node.data, status: 'failed' } }
+                            : node
+                    ));
                 }
             }
             return null;
@@ -1,3 +1,5 @@
+import { decodeColumnar } from './columnar';
+
 const API_BASE_URL = 'http://127.0.0.1:8000';
 
 // Removed TypeScript interfaces - in JavaScript, we'll use JSDoc comments for documentation if needed
@@ -20,7 +22,31 @@ export class ApiService {
             body: JSON.stringify(input),
         });
         if (!response.ok) {
-            throw new Error(`Failed to start calculation for node ${input.nodeId}`);
+            const error = new Error(`Failed to start calculation for node ${input.nodeId}`);
+            error.status = response.status;
+            throw error;
+        }
+        return response.json();
+    }
+
+    static async runPipeline(targetNode, parameters) {
+        const response = await fetch(`${API_BASE_URL}/pipeline/run`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ targetNode, parameters }),
+        });
+        if (!response.ok) {
+            throw new Error(`Failed to start pipeline for node ${targetNode}`);
+        }
+        return response.json();
+    }
+
+    static async getPipelineStatus(pipelineId) {
+        const response = await fetch(`${API_BASE_URL}/pipeline/status/${pipelineId}`);
+        if (!response.ok) {
+            throw new Error('Failed to get pipeline status');
         }
         return response.json();
     }
@@ -33,6 +59,110 @@ export class ApiService {
         return response.json();
     }
 
+    // The server sends an ETag, so repeated fetches of an unchanged output are
+    // revalidated by the browser cache and answered with 304 Not Modified.
+    static async getProcessOutput(processId) {
+        const response = await fetch(`${API_BASE_URL}/output/${processId}`);
+        if (!response.ok) {
+            throw new Error('Failed to get process output');
+        }
+        return response.json();
+    }
+
+    // filterModel uses AG Grid's filter model shape (set/text/number filters);
+    // sortModel is a list of { colId, sort: 'asc' | 'desc' }. With format 'columnar'
+    // the page arrives as typed column buffers and resolves to decodeColumnar's result.
+    static async getOutputRows(processId, { offset = 0, limit = 100, columns, filterModel, sortModel, format = 'json' } = {}) {
+        const query = new URLSearchParams({ offset, limit, format });
+        if (columns && columns.length > 0) {
+            query.set('columns', columns.join(','));
+        }
+        if (filterModel && Object.keys(filterModel).length > 0) {
+            query.set('filter', JSON.stringify(filterModel));
+        }
+        if (sortModel && sortModel.length > 0) {
+            query.set('sort', sortModel.map(({ colId, sort }) => `${colId}:${sort}`).join(','));
+        }
+        const response = await fetch(`${API_BASE_URL}/output/${processId}/rows?${query}`);
+        if (!response.ok) {
+            throw new Error('Failed to get output rows');
+        }
+        return format === 'columnar' ? decodeColumnar(await response.arrayBuffer()) : response.json();
+    }
+
+    // URL of the streamed CSV export of a node's full result table; assign it to
+    // a link or window.location so the browser downloads it without buffering.
+    static getExportCsvUrl(processId, { columns, filterModel, sortModel } = {}) {
+        const query = new URLSearchParams();
+        if (columns && columns.length > 0) {
+            query.set('columns', columns.join(','));
+        }
+        if (filterModel && Object.keys(filterModel).length > 0) {
+            query.set('filter', JSON.stringify(filterModel));
+        }
+        if (sortModel && sortModel.length > 0) {
+            query.set('sort', sortModel.map(({ colId, sort }) => `${colId}:${sort}`).join(','));
+        }
+        return `${API_BASE_URL}/output/${processId}/export.csv?${query}`;
+    }
+
+    static async getProcessStatuses(processIds, includeOutput = false) {
+        const response = await fetch(`${API_BASE_URL}/status/batch`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ process_ids: processIds, include_output: includeOutput }),
+        });
+        if (!response.ok) {
+            throw new Error('Failed to get process statuses');
+        }
+        return response.json();
+    }
+
+    // Resolves with the final status once the process completes, fails or is stopped.
+    // Status transitions are pushed by the server over Server-Sent Events.
+    static waitForProcess(processId, onUpdate) {
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`${API_BASE_URL}/events/${processId}`);
+            source.addEventListener('status', (event) => {
+                const status = JSON.parse(event.data);
+                if (onUpdate) {
+                    onUpdate(status);
+                }
+                if (['completed', 'failed', 'stopped', 'reset'].includes(status.status)) {
+                    source.close();
+                    resolve(status);
+                }
+            });
+            source.onerror = () => {
+                source.close();
+                reject(new Error('Lost connection to process event stream'));
+            };
+        });
+    }
+
+    // Streams the status of every node of a pipeline over a single Server-Sent
+    // Events connection; resolves once all of them have finished.
+    static waitForPipeline(pipelineId, onUpdate) {
+        return new Promise((resolve, reject) => {
+            const source = new EventSource(`${API_BASE_URL}/pipeline/events/${pipelineId}`);
+            source.addEventListener('status', (event) => {
+                if (onUpdate) {
+                    onUpdate(JSON.parse(event.data));
+                }
+            });
+            source.addEventListener('end', () => {
+                source.close();
+                resolve();
+            });
+            source.onerror = () => {
+                source.close();
+                reject(new Error('Lost connection to pipeline event stream'));
+            };
+        });
+    }
+
     static async stopProcess(processId) {
         const response = await fetch(`${API_BASE_URL}/stop/${processId}`, {
             method: 'POST',
@@ -0,0 +1,74 @@
+// Decoder for the columnar transfer format of the /output endpoints (format=columnar).
+//
+// Layout (little-endian): 8 magic bytes "NTCOLS01", a uint32 header length and
+// the UTF-8 JSON header, padded to 8 bytes; then for every column in header
+// order its buffers, each a uint64 byte length followed by the data padded to
+// 8 bytes. Numeric columns have one buffer; "string" and "json" columns have
+// Uint32Array offsets (numRows + 1) followed by the UTF-8 data.
+
+const MAGIC = 'NTCOLS01';
+
+const NUMERIC_ARRAYS = {
+    int32: Int32Array,
+    int64: BigInt64Array,
+    float64: Float64Array,
+};
+
+const align8 = (position) => position + ((8 - (position % 8)) % 8);
+
+// Returns { ...header, columns: [{ name, type, values }] }. Numeric values are
+// TypedArray views over `buffer` (no copy); text values are decoded lazily by
+// `get(rowIndex)` on string and json columns.
+export function decodeColumnar(buffer) {
+    const bytes = new Uint8Array(buffer);
+    const view = new DataView(buffer);
+    const decoder = new TextDecoder();
+    if (decoder.decode(bytes.subarray(0, 8)) !== MAGIC) {
+        throw new Error('Not a columnar table payload');
+    }
+    const headerLength = view.getUint32(8, true);
+    const header = JSON.parse(decoder.decode(bytes.subarray(12, 12 + headerLength)));
+    let position = align8(12 + headerLength);
+
+    const nextBuffer = () => {
+        // Lengths stay far below 2^53, so the low/high split is exact
+        const length = view.getUint32(position, true) + view.getUint32(position + 4, true) * 2 ** 32;
+        const start = position + 8;
+        position = align8(start + length);
+        return { start, length };
+    };
+
+    const columns = header.columns.map(({ name, type }) => {
+        if (NUMERIC_ARRAYS[type]) {
+            const ArrayType = NUMERIC_ARRAYS[type];
+            const { start, length } = nextBuffer();
+            return { name, type, values: new ArrayType(buffer, start, length / ArrayType.BYTES_PER_ELEMENT) };
+        }
+        const offsetsBuffer = nextBuffer();
+        const offsets = new Uint32Array(buffer, offsetsBuffer.start, offsetsBuffer.length / 4);
+        const dataBuffer = nextBuffer();
+        const data = bytes.subarray(dataBuffer.start, dataBuffer.start + dataBuffer.length);
+        const get = (rowIndex) => {
+            const text = decoder.decode(data.subarray(offsets[rowIndex], offsets[rowIndex + 1]));
+            return type === 'json' ? JSON.parse(text) : text;
+        };
+        return { name, type, offsets, data, get };
+    });
+
+    return { ...header, columns };
+}
+
+// Row-major copy of a decoded table, e.g. for AG Grid rowData; int64 cells
+// become Numbers (exact up to 2^53).
+export function columnarToRows(table) {
+    const getters = table.columns.map((column) => {
+        if (column.get) return column.get;
+        if (column.type === 'int64') return (rowIndex) => Number(column.values[rowIndex]);
+        return (rowIndex) => column.values[rowIndex];
+    });
+    const rows = new Array(table.num_rows);
+    for (let rowIndex = 0; rowIndex < table.num_rows; rowIndex++) {
+        rows[rowIndex] = getters.map((get) => get(rowIndex));
+    }
+    return rows;
+}